@@ -0,0 +1,22 @@
+"""
+Build the static plan bundle
+Pre-renders every distinct workout/diet section into static/plans/ so the app
+can serve plans without re-rendering. Re-run after editing plans in planner.py
+or the renderers in fragments.py.
+
+Usage: python build_plans.py [output_dir]
+"""
+
+import sys
+
+from fragments import BUNDLE_DIR, MANIFEST_NAME, build_bundle, fragment_names
+
+
+def main():
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else BUNDLE_DIR
+    manifest = build_bundle(out_dir)
+    print(f"✅ Wrote {len(fragment_names(manifest))} fragments + {MANIFEST_NAME} to {out_dir}")
+    print(f"   Catalog version: {manifest['catalog_version']}, bundle version: {manifest['bundle_version']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Cohort analytics for uploaded student rosters
+Reads the CSV in chunks so large rosters are summarized with bounded memory
+"""
+
+import hashlib
+import re
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+
+from fragments import render_plan_text
+from planner import (
+    GOALS,
+    BMI_CATEGORY_LABELS,
+    INTENSITY_LABELS,
+    FOCUS_LABELS,
+    WORKOUT_TYPE_LABELS,
+    calculate_bmi_vectorized,
+    get_workout_parameters_vectorized,
+)
+
+# Columns the roster must provide, plus optional ones with sidebar defaults
+REQUIRED_COLUMNS = ["height", "weight", "age", "goal"]
+OPTIONAL_COLUMNS = {"workout_time": 45}
+# Diet columns, when present the roster also yields per-profile counts for procurement
+DIET_COLUMNS = ["diet_pref", "budget"]
+NUMERIC_COLUMNS = ["height", "weight", "age", "workout_time"]
+
+# Profile columns used for per-student plan files, and accepted student ID columns
+ARCHIVE_COLUMNS = ["gender", "diet_pref", "budget"]
+ID_COLUMNS = ["student_id", "id", "roll_no", "name"]
+
+CHUNK_ROWS = 200_000
+ARCHIVE_CHUNK_ROWS = 2_000
+# Plan files zip to about 1.7 KB each at about 4k rows/s, so the limit keeps an
+# archive near 85 MB and a build under a minute, well inside the export cache
+ARCHIVE_MAX_ROWS = 50_000
+HASH_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+# Stream a file through SHA-256 so uploads can be cached by content
+def file_hash(source):
+    """Return the hex SHA-256 of a path or binary file object"""
+    digest = hashlib.sha256()
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+        source.seek(0)
+    return digest.hexdigest()
+
+def _normalize_column(name):
+    return str(name).strip().lower().replace(" ", "_")
+
+# Parse numbers and fill optional columns, return the mask of usable rows
+def _prepare_chunk(chunk):
+    for column in NUMERIC_COLUMNS:
+        if column in chunk.columns and not pd.api.types.is_numeric_dtype(chunk[column]):
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+    # Optional means optional per cell too, blanks get the sidebar default
+    for column, default in OPTIONAL_COLUMNS.items():
+        chunk[column] = chunk[column].fillna(default) if column in chunk.columns else default
+    return chunk[REQUIRED_COLUMNS].notna().all(axis=1) & (chunk["height"] > 0)
+
+# Summarize one chunk of the roster into value counts
+def _summarize_chunk(chunk):
+    valid = _prepare_chunk(chunk)
+    rows = chunk[valid]
+    goal = rows["goal"].map(str.strip)
+    
+    bmi, category = calculate_bmi_vectorized(rows["weight"].to_numpy(), rows["height"].to_numpy())
+    params = get_workout_parameters_vectorized(
+        bmi, goal.to_numpy(dtype=object), rows["workout_time"].to_numpy(), rows["age"].to_numpy()
+    )
+    
+    counts = {
+        "bmi_category": pd.Series(category, dtype=object).value_counts(),
+        "intensity": pd.Series(params['intensity'], dtype=object).value_counts(),
+        "focus": pd.Series(params['focus'], dtype=object).value_counts(),
+        "type": pd.Series(params['type'], dtype=object).value_counts(),
+        "goal": goal.value_counts(),
+    }
+    if all(column in chunk.columns for column in DIET_COLUMNS):
+        diet = {column: rows[column].map(str.strip, na_action="ignore") for column in DIET_COLUMNS}
+        counts["profile"] = pd.DataFrame({**diet, "goal": goal}).value_counts(dropna=False)
+    totals = {
+        "rows": len(rows),
+        "skipped": int((~valid).sum()),
+        "bmi_sum": float(bmi.sum()),
+        "score_sum": float(params['score'].sum()),
+    }
+    return counts, totals
+
+# Summarize a whole roster CSV chunk by chunk
+def summarize_roster(source, chunk_rows=CHUNK_ROWS):
+    """Return distribution tables and totals for a roster CSV
+
+    Only the planner columns are parsed and each chunk is reduced to value
+    counts before the next one is read, so memory stays bounded by chunk_rows.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+    header = pd.read_csv(source, nrows=0).columns
+    columns = {c: _normalize_column(c) for c in header}
+    wanted = set(REQUIRED_COLUMNS) | set(OPTIONAL_COLUMNS) | set(DIET_COLUMNS)
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns.values()]
+    if missing:
+        raise ValueError(f"Roster is missing required columns: {', '.join(missing)}")
+    
+    if hasattr(source, "seek"):
+        source.seek(0)
+    usecols = [raw for raw, name in columns.items() if name in wanted]
+    categorical = {raw: "category" for raw, name in columns.items() if name in ["goal"] + DIET_COLUMNS}
+    reader = pd.read_csv(
+        source,
+        usecols=usecols,
+        dtype=categorical,
+        chunksize=chunk_rows,
+    )
+    
+    counts = {}
+    totals = {"rows": 0, "skipped": 0, "bmi_sum": 0.0, "score_sum": 0.0}
+    for chunk in reader:
+        chunk = chunk.rename(columns=columns)
+        chunk_counts, chunk_totals = _summarize_chunk(chunk)
+        for name, series in chunk_counts.items():
+            counts[name] = series if name not in counts else counts[name].add(series, fill_value=0)
+        for name, value in chunk_totals.items():
+            totals[name] += value
+    
+    # Chart and table order, the same labels the vectorized planner produces
+    orders = {
+        "bmi_category": list(BMI_CATEGORY_LABELS),
+        "intensity": list(INTENSITY_LABELS),
+        "focus": list(FOCUS_LABELS),
+        "type": list(WORKOUT_TYPE_LABELS),
+        "goal": GOALS,
+    }
+    distributions = {}
+    for name, order in orders.items():
+        series = counts.get(name, pd.Series(dtype="int64"))
+        extra = [k for k in series.index if k not in order]
+        distributions[name] = series.reindex(order + extra, fill_value=0).astype("int64")
+    
+    # (diet_pref, budget, goal) groups with a 'students' count, see procurement.py
+    profiles = None
+    if "profile" in counts:
+        profiles = counts["profile"].rename("students").reset_index()
+        profiles["students"] = profiles["students"].astype("int64")
+    
+    rows = totals["rows"]
+    return {
+        "distributions": distributions,
+        "profiles": profiles,
+        "rows": rows,
+        "skipped": totals["skipped"],
+        "mean_bmi": round(totals["bmi_sum"] / rows, 2) if rows else None,
+        "mean_score": round(totals["score_sum"] / rows, 2) if rows else None,
+    }
+
+def _count_rows(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+        lines = sum(block.count(b"\n") for block in iter(lambda: source.read(HASH_BLOCK_BYTES), b""))
+        source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            lines = sum(block.count(b"\n") for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""))
+    return max(lines - 1, 1)
+
+def _plain(value):
+    return int(value) if float(value).is_integer() else value
+
+# One plan file per student, zipped, for mess staff and mentors
+def build_cohort_archive(
+    source, path, bundle, report=None, chunk_rows=ARCHIVE_CHUNK_ROWS, generated_at=None, max_rows=ARCHIVE_MAX_ROWS
+):
+    """Write a ZIP with the complete TXT plan of every valid roster row
+
+    Plans are assembled from the pre-rendered bundle (see fragments.py) with
+    the vectorized BMI / workout parameters, chunk by chunk, so memory stays
+    bounded. report(fraction, message) is called after each chunk, and every
+    plan carries the same generated_at timestamp (now by default). Rosters
+    with more than max_rows rows raise ValueError.
+    """
+    total_rows = _count_rows(source)
+    if max_rows is not None and total_rows > max_rows:
+        raise ValueError(f"Roster has {total_rows:,} rows, plan archives are limited to {max_rows:,}")
+    header = pd.read_csv(source, nrows=0).columns
+    columns = {c: _normalize_column(c) for c in header}
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns.values()]
+    if missing:
+        raise ValueError(f"Roster is missing required columns: {', '.join(missing)}")
+    id_column = next((c for c in ID_COLUMNS if c in columns.values()), None)
+    
+    if hasattr(source, "seek"):
+        source.seek(0)
+    wanted = set(REQUIRED_COLUMNS) | set(OPTIONAL_COLUMNS) | set(ARCHIVE_COLUMNS) | {id_column}
+    usecols = [raw for raw, name in columns.items() if name in wanted]
+    reader = pd.read_csv(source, usecols=usecols, dtype=str, chunksize=chunk_rows)
+    
+    if generated_at is None:
+        generated_at = datetime.now()
+    done = written = 0
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for chunk in reader:
+            chunk = chunk.rename(columns=columns)
+            done += len(chunk)
+            for column in ARCHIVE_COLUMNS:
+                if column not in chunk.columns:
+                    chunk[column] = "-"
+            valid = _prepare_chunk(chunk)
+            rows = chunk[valid]
+            goal = rows["goal"].str.strip()
+            bmi, category = calculate_bmi_vectorized(rows["weight"].to_numpy(), rows["height"].to_numpy())
+            params = get_workout_parameters_vectorized(
+                bmi, goal.to_numpy(dtype=object), rows["workout_time"].to_numpy(), rows["age"].to_numpy()
+            )
+            
+            records = zip(
+                rows.index, goal, rows["age"], rows["gender"], rows["height"], rows["weight"],
+                rows["workout_time"], rows["diet_pref"].fillna("-").str.strip(),
+                rows["budget"].fillna("-").str.strip(),
+                rows[id_column] if id_column else rows.index, bmi, category,
+                params['intensity'], params['focus'], params['type'], params['score'],
+            )
+            for (index, goal_, age, gender, height, weight, workout_time, diet_pref, budget,
+                 student, bmi_, category_, intensity, focus, workout_type, score) in records:
+                profile = {
+                    'age': _plain(age), 'gender': gender if isinstance(gender, str) else "-",
+                    'height': _plain(height), 'weight': _plain(weight), 'goal': goal_,
+                    'workout_time': _plain(workout_time), 'diet_pref': diet_pref, 'budget': budget,
+                }
+                results = {
+                    'bmi': float(bmi_), 'bmi_category': category_,
+                    'workout_params': {
+                        'intensity': intensity, 'focus': focus, 'type': workout_type, 'score': float(score)
+                    },
+                }
+                text = render_plan_text(
+                    profile, results,
+                    bundle.workout(goal_)['export'], bundle.diet(diet_pref, budget, goal_)['export'],
+                    generated_at,
+                )
+                name = f"{index + 1:06d}"
+                if id_column:
+                    name += "_" + re.sub(r"[^\w.-]+", "_", str(student)).strip("._")[:60]
+                archive.writestr(f"{name}.txt", text)
+                written += 1
+            
+            if report is not None:
+                report(done / total_rows, f"{written:,} plans written")
+    return written
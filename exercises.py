@@ -0,0 +1,281 @@
+"""
+Exercise catalog with bitset indexes
+Every exercise named in the workout plans (plus bodyweight / low-impact
+alternatives) with its muscle group, equipment, impact level, time per set and
+the joints it loads. Each attribute value maps to an int bitmask over the
+catalog, so filtered substitution queries are a few AND operations.
+"""
+
+import re
+from bisect import bisect_right
+
+IMPACT_LEVELS = ["Low", "Medium", "High"]
+
+# name: muscle group, equipment, impact, minutes per set, joints loaded and the
+# prescription used when a swap can't keep the plan's sets/reps
+EXERCISES = {
+    # Chest
+    "Bench press/Push-ups": {"muscle": "Chest", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder", "wrist"], "prescription": "4 sets × 10 reps"},
+    "Push-ups": {"muscle": "Chest", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder", "wrist"], "prescription": "3 sets × 12 reps"},
+    "Incline dumbbell press": {"muscle": "Chest", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Chest flyes": {"muscle": "Chest", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Dumbbell press": {"muscle": "Chest", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Incline push-ups": {"muscle": "Chest", "equipment": "Chair", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 12 reps"},
+    "Knee push-ups": {"muscle": "Chest", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 12 reps"},
+    # Arms (triceps / biceps)
+    "Tricep dips": {"muscle": "Triceps", "equipment": "Chair", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder", "wrist"], "prescription": "3 sets × 12 reps"},
+    "Overhead tricep extension": {"muscle": "Triceps", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "3 sets × 15 reps"},
+    "Bicep curls": {"muscle": "Biceps", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 15 reps"},
+    "Hammer curls": {"muscle": "Biceps", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 15 reps"},
+    "Diamond push-ups": {"muscle": "Triceps", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 10 reps"},
+    "Close-grip push-ups": {"muscle": "Triceps", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 12 reps"},
+    "Towel curls": {"muscle": "Biceps", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 15 reps"},
+    "Resistance band curls": {"muscle": "Biceps", "equipment": "Resistance Band", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 15 reps"},
+    # Back
+    "Pull-ups/Chin-ups": {"muscle": "Back", "equipment": "Pull-up Bar", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "4 sets × 8 reps"},
+    "Bent-over rows": {"muscle": "Back", "equipment": "Barbell", "impact": "Low", "set_minutes": 1.5, "joints": ["lower back"], "prescription": "4 sets × 12 reps"},
+    "Dumbbell rows": {"muscle": "Back", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 12 reps"},
+    "Rows": {"muscle": "Back", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 12 reps"},
+    "Lat pulldowns": {"muscle": "Back", "equipment": "Machine", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Table rows": {"muscle": "Back", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 10 reps"},
+    "Superman holds": {"muscle": "Back", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 30 sec"},
+    "Resistance band rows": {"muscle": "Back", "equipment": "Resistance Band", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 15 reps"},
+    # Shoulders
+    "Military press": {"muscle": "Shoulders", "equipment": "Barbell", "impact": "Low", "set_minutes": 1.5, "joints": ["shoulder"], "prescription": "4 sets × 10 reps"},
+    "Lateral raises": {"muscle": "Shoulders", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Front raises": {"muscle": "Shoulders", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder"], "prescription": "3 sets × 12 reps"},
+    "Rear delt flyes": {"muscle": "Shoulders", "equipment": "Dumbbells", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 15 reps"},
+    "Pike push-ups": {"muscle": "Shoulders", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder", "wrist"], "prescription": "3 sets × 10 reps"},
+    "Arm circles": {"muscle": "Shoulders", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 30 sec"},
+    "Band pull-aparts": {"muscle": "Shoulders", "equipment": "Resistance Band", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 15 reps"},
+    # Legs
+    "Squats": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.5, "joints": ["knee"], "prescription": "3 sets × 15 reps"},
+    "Jump squats": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "High", "set_minutes": 1.0, "joints": ["knee", "ankle"], "prescription": "4 sets × 15 reps"},
+    "Lunges": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 2.0, "joints": ["knee"], "prescription": "3 sets × 12 reps each leg"},
+    "Bulgarian split squats": {"muscle": "Legs", "equipment": "Chair", "impact": "Low", "set_minutes": 2.0, "joints": ["knee"], "prescription": "3 sets × 10 reps each leg"},
+    "Leg press": {"muscle": "Legs", "equipment": "Machine", "impact": "Low", "set_minutes": 1.5, "joints": ["knee"], "prescription": "4 sets × 12 reps"},
+    "Leg extensions": {"muscle": "Legs", "equipment": "Machine", "impact": "Low", "set_minutes": 1.5, "joints": ["knee"], "prescription": "3 sets × 15 reps"},
+    "Leg curls": {"muscle": "Legs", "equipment": "Machine", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "4 sets × 12 reps"},
+    "Deadlifts": {"muscle": "Legs", "equipment": "Barbell", "impact": "Low", "set_minutes": 1.5, "joints": ["lower back"], "prescription": "3 sets × 10 reps"},
+    "Romanian deadlifts": {"muscle": "Legs", "equipment": "Barbell", "impact": "Low", "set_minutes": 1.5, "joints": ["lower back"], "prescription": "4 sets × 10 reps"},
+    "Calf raises": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["ankle"], "prescription": "4 sets × 20 reps"},
+    "Glute bridges": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 15 reps"},
+    "Single-leg glute bridges": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.5, "joints": [], "prescription": "3 sets × 12 reps each leg"},
+    "Side-lying leg raises": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 15 reps each leg"},
+    "Wall sit": {"muscle": "Legs", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["knee"], "prescription": "3 sets × 45 sec"},
+    "Step-ups": {"muscle": "Legs", "equipment": "Chair", "impact": "Low", "set_minutes": 1.5, "joints": ["knee"], "prescription": "3 sets × 12 reps each leg"},
+    # Core
+    "Plank": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 45 sec"},
+    "Plank variations": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 40 sec each"},
+    "Leg raises": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["lower back"], "prescription": "3 sets × 15 reps"},
+    "Hanging leg raises": {"muscle": "Core", "equipment": "Pull-up Bar", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder"], "prescription": "4 sets × 12 reps"},
+    "Russian twists": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["lower back"], "prescription": "3 sets × 25 reps"},
+    "Bicycle crunches": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 20 reps"},
+    "Dead bugs": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 10 reps each side"},
+    "Bird dogs": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 10 reps each side"},
+    "Side plank": {"muscle": "Core", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["shoulder"], "prescription": "3 sets × 30 sec each side"},
+    # Full body
+    "Burpees": {"muscle": "Full Body", "equipment": "Bodyweight", "impact": "High", "set_minutes": 1.0, "joints": ["knee", "wrist"], "prescription": "3 sets × 12 reps"},
+    "Mountain climbers": {"muscle": "Full Body", "equipment": "Bodyweight", "impact": "Medium", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 20 reps"},
+    "Step-back burpees": {"muscle": "Full Body", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 12 reps"},
+    "Inchworms": {"muscle": "Full Body", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 8 reps"},
+    "Bear crawls": {"muscle": "Full Body", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": ["wrist"], "prescription": "3 sets × 30 sec"},
+    # Cardio
+    "Jumping jacks": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "High", "set_minutes": 1.0, "joints": ["knee", "ankle"], "prescription": "3 sets × 30 reps"},
+    "High knees": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "High", "set_minutes": 0.5, "joints": ["knee", "ankle"], "prescription": "4 sets × 30 sec"},
+    "Jump rope": {"muscle": "Cardio", "equipment": "Jump Rope", "impact": "High", "set_minutes": 2.0, "joints": ["knee", "ankle"], "prescription": "5 sets × 2 min"},
+    "Sprint intervals": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "High", "set_minutes": 1.0, "joints": ["knee", "ankle"], "prescription": "30 sec sprint, 30 sec rest × 10"},
+    "Running": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Medium", "set_minutes": 5.0, "joints": ["knee", "ankle"], "prescription": "25 min"},
+    "Running/Cycling": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Medium", "set_minutes": 5.0, "joints": ["knee", "ankle"], "prescription": "30 min moderate pace"},
+    "Walking/Cycling": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 5.0, "joints": [], "prescription": "30 min (easy pace)"},
+    "Walking": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 5.0, "joints": [], "prescription": "30 min"},
+    "Low-impact jacks": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "3 sets × 30 reps"},
+    "Marching in place": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 1.0, "joints": [], "prescription": "4 sets × 1 min"},
+    "Shadow boxing": {"muscle": "Cardio", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 2.0, "joints": [], "prescription": "5 sets × 2 min"},
+    "Stationary cycling": {"muscle": "Cardio", "equipment": "Bike", "impact": "Low", "set_minutes": 5.0, "joints": [], "prescription": "20 min"},
+    "Swimming": {"muscle": "Cardio", "equipment": "Pool", "impact": "Low", "set_minutes": 5.0, "joints": ["shoulder"], "prescription": "20 min"},
+    # Flexibility
+    "Yoga": {"muscle": "Flexibility", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 5.0, "joints": [], "prescription": "30 min"},
+    "Light yoga": {"muscle": "Flexibility", "equipment": "Bodyweight", "impact": "Low", "set_minutes": 5.0, "joints": [], "prescription": "30 min"},
+}
+
+# One-click constraints offered in the app
+CONSTRAINT_PRESETS = {
+    "🏠 No equipment": {'equipment': ["Bodyweight"]},
+    "🦵 Knee-friendly": {'avoid_joints': ["knee"]},
+    "🤫 Low impact": {'max_impact': "Low"},
+    "🖐️ Wrist-friendly": {'avoid_joints': ["wrist"]},
+}
+
+# Exercise lines in the plans look like "  - Squats: 3 sets × 20 reps"
+EXERCISE_LINE = re.compile(r"^(\s*- )([^:]+)(:.*)$")
+# Activities named inside header lines, e.g. "🏃 Cardio: 25 min running/cycling"
+ACTIVITY_PHRASES = {"running/cycling": "Running/Cycling", "jogging": "Running"}
+ACTIVITY_PHRASE = re.compile("|".join(re.escape(phrase) for phrase in ACTIVITY_PHRASES), re.IGNORECASE)
+
+# Shape of a prescription: intervals, timed sets or reps, and whether it's per side
+INTERVAL = re.compile(r"\brest\b")
+TIMED = re.compile(r"\d+\s*(?:sec|min)\b")
+REPS = re.compile(r"\breps?\b")
+PER_SIDE = re.compile(r"\d+(?: reps)? each\b|\beach (?:leg|side|arm)\b")
+
+
+def prescription_kind(text):
+    """('interval' | 'timed' | 'reps', per side) for a sets/reps/time prescription"""
+    if INTERVAL.search(text):
+        kind = "interval"
+    elif TIMED.search(text) and not REPS.search(text):
+        kind = "timed"
+    else:
+        kind = "reps"
+    return kind, bool(PER_SIDE.search(text))
+
+
+class ExerciseCatalog:
+    """Exercise attributes with inverted bitset indexes for fast filtering"""
+
+    def __init__(self, exercises=EXERCISES):
+        self.names = list(exercises)
+        self.exercises = exercises
+        self.position = {name: i for i, name in enumerate(self.names)}
+        self.all_mask = (1 << len(self.names)) - 1
+
+        # attribute -> value -> bitmask of exercises with that value
+        self.index = {"muscle": {}, "equipment": {}, "impact": {}, "joints": {}}
+        for i, name in enumerate(self.names):
+            bit = 1 << i
+            info = exercises[name]
+            for attr in ("muscle", "equipment", "impact"):
+                self.index[attr][info[attr]] = self.index[attr].get(info[attr], 0) | bit
+            for joint in info["joints"]:
+                self.index["joints"][joint] = self.index["joints"].get(joint, 0) | bit
+
+        # Cumulative masks for "at most" queries on impact and time per set
+        self.impact_at_most = {}
+        mask = 0
+        for level in IMPACT_LEVELS:
+            mask |= self.index["impact"].get(level, 0)
+            self.impact_at_most[level] = mask
+        self.set_minutes = sorted({info["set_minutes"] for info in exercises.values()})
+        self.minutes_at_most = []
+        mask = 0
+        for minutes in self.set_minutes:
+            for i, name in enumerate(self.names):
+                if exercises[name]["set_minutes"] == minutes:
+                    mask |= 1 << i
+            self.minutes_at_most.append(mask)
+
+    def _union(self, attr, values):
+        if isinstance(values, str):
+            values = [values]
+        mask = 0
+        for value in values:
+            mask |= self.index[attr].get(value, 0)
+        return mask
+
+    def mask(self, muscle=None, equipment=None, max_impact=None, max_set_minutes=None, avoid_joints=()):
+        """Bitmask of exercises matching every given constraint"""
+        mask = self.all_mask
+        if muscle is not None:
+            mask &= self._union("muscle", muscle)
+        if equipment is not None:
+            mask &= self._union("equipment", equipment)
+        if max_impact is not None:
+            mask &= self.impact_at_most[max_impact]
+        if max_set_minutes is not None:
+            i = bisect_right(self.set_minutes, max_set_minutes)
+            mask &= self.minutes_at_most[i - 1] if i else 0
+        if avoid_joints:
+            mask &= ~self._union("joints", avoid_joints)
+        return mask
+
+    def names_in(self, mask):
+        """Exercise names for the set bits of a mask, in catalog order"""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def query(self, **constraints):
+        """Names of exercises matching the constraints"""
+        return self.names_in(self.mask(**constraints))
+
+    def allows(self, name, mask):
+        return name in self.position and (mask >> self.position[name]) & 1 == 1
+
+    def substitutes(self, name, mask=None, **constraints):
+        """Same-muscle alternatives to an exercise, closest time per set first"""
+        if name not in self.exercises:
+            return []
+        if mask is None:
+            mask = self.mask(**constraints)
+        info = self.exercises[name]
+        mask &= self.index["muscle"][info["muscle"]] & ~(1 << self.position[name])
+        candidates = self.names_in(mask)
+        candidates.sort(key=lambda other: abs(self.exercises[other]["set_minutes"] - info["set_minutes"]))
+        return candidates
+
+    def _match(self, line):
+        """Catalog exercise a plan line prescribes and a function that swaps it, or (None, None)"""
+        match = EXERCISE_LINE.match(line)
+        if match and match.group(2) in self.position:
+            name = match.group(2)
+
+            def swap_in(swap):
+                # Keep the plan's sets/reps unless they don't fit the new exercise
+                dose = match.group(3)
+                default = self.exercises[swap]["prescription"]
+                if prescription_kind(dose) != prescription_kind(default):
+                    dose = f": {default}"
+                return f"{match.group(1)}{swap}{dose} (instead of {name})"
+            return name, swap_in
+        phrase = ACTIVITY_PHRASE.search(line)
+        if phrase:
+            return ACTIVITY_PHRASES[phrase.group().lower()], lambda swap: (
+                f"{line[:phrase.start()]}{swap.lower()}{line[phrase.end():]} (instead of {phrase.group()})"
+            )
+        return None, None
+
+    def replan(self, workout_plan, **constraints):
+        """Copy of a 7-day plan with every disallowed exercise swapped out
+
+        Exercise lines and activities named in headers (running, jogging) are
+        checked. Exercises with no allowed alternative are kept and flagged,
+        other lines (headers, rest notes) are left as they are.
+        """
+        mask = self.mask(**constraints)
+        new_plan = {}
+        for day, lines in workout_plan.items():
+            matches = [self._match(line) for line in lines]
+            # Everything already on the day, so a swap never repeats a later line
+            used = {name for name, _ in matches if name is not None}
+            new_lines = []
+            for line, (name, swap_in) in zip(lines, matches):
+                if name is None or self.allows(name, mask):
+                    new_lines.append(line)
+                    continue
+                options = self.substitutes(name, mask)
+                fresh = [option for option in options if option not in used]
+                if options:
+                    swap = (fresh or options)[0]
+                    used.add(swap)
+                    new_lines.append(swap_in(swap))
+                else:
+                    new_lines.append(f"{line} ⚠️ no suitable swap")
+            new_plan[day] = new_lines
+        return new_plan
+
+# Combine presets into one set of query constraints
+def combine_presets(labels):
+    constraints = {}
+    for label in labels:
+        for key, value in CONSTRAINT_PRESETS[label].items():
+            if key == 'avoid_joints':
+                constraints[key] = sorted(set(constraints.get(key, [])) | set(value))
+            elif key == 'equipment' and key in constraints:
+                constraints[key] = [v for v in constraints[key] if v in value]
+            else:
+                constraints[key] = value
+    return constraints
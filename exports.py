@@ -0,0 +1,190 @@
+"""
+Background export jobs
+Heavy exports run on a bounded thread pool so Streamlit reruns never wait on
+them. Finished artifacts are cached on disk under a key derived from their
+inputs, and the cache evicts least recently used files past a size limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".export_cache")
+MAX_WORKERS = 2
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+SPOOL_BLOCK_BYTES = 8 * 1024 * 1024
+# Failed jobs stay visible this long unless they are submitted again
+FAILED_JOB_SECONDS = 3600
+
+
+# Cache key for an export, from its kind and everything its content depends on
+def export_key(kind, *inputs):
+    payload = json.dumps([kind, *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+# Copy an upload to disk so a worker never holds it in memory
+def spool(source, suffix=""):
+    """Copy a binary file object to a new temp file in blocks, return its path"""
+    fd, path = tempfile.mkstemp(prefix="export-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            source.seek(0)
+            shutil.copyfileobj(source, f, SPOOL_BLOCK_BYTES)
+            source.seek(0)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+class ArtifactCache:
+    """Finished export files on disk, evicted by total size (LRU by mtime)"""
+
+    def __init__(self, cache_dir=EXPORT_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key, ext):
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, key, ext):
+        """Path of a cached artifact, or None; a hit counts as a use"""
+        path = self.path(key, ext)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, ext, write):
+        """Run write(tmp_path), move the result into place and evict"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(key, ext)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete least recently used artifacts until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+
+class ExportJob:
+    """State of one export, updated by the worker and read by the UI"""
+
+    def __init__(self, key, ext, file_name):
+        self.key = key
+        self.ext = ext
+        self.file_name = file_name
+        self.progress = 0.0
+        self.message = "Queued"
+        self.path = None
+        self.error = None
+        self.started = time.time()
+
+    @property
+    def done(self):
+        return self.path is not None or self.error is not None
+
+    def report(self, progress, message=None):
+        """Progress callback handed to the export builder"""
+        self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+
+class ExportQueue:
+    """Bounded pool of export workers in front of an ArtifactCache"""
+
+    def __init__(self, cache=None, max_workers=MAX_WORKERS):
+        self.cache = cache or ArtifactCache()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, ext, file_name, build, cleanup=None):
+        """Queue build(path, report) unless the artifact is cached or already running
+
+        Returns the ExportJob; cached artifacts come back already done.
+        cleanup() runs once the build finishes, or right away when nothing
+        was queued, e.g. to delete a spooled input file.
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is None or job.error is not None:
+                job = ExportJob(key, ext, file_name)
+                cached = self.cache.get(key, ext)
+                if cached is not None:
+                    job.report(1.0, "Ready")
+                    job.path = cached
+                else:
+                    self._pool.submit(self._run, job, build, cleanup)
+                    cleanup = None
+                self._jobs[key] = job
+        if cleanup is not None:
+            cleanup()
+        return job
+
+    def get(self, key):
+        with self._lock:
+            self._prune()
+            return self._jobs.get(key)
+
+    def _prune(self):
+        # Forget finished jobs whose artifact was evicted, and old failures
+        now = time.time()
+        for key, job in list(self._jobs.items()):
+            if job.error is not None:
+                stale = now - job.started > FAILED_JOB_SECONDS
+            else:
+                stale = job.path is not None and not os.path.exists(job.path)
+            if stale:
+                del self._jobs[key]
+
+    def _run(self, job, build, cleanup=None):
+        job.report(0.0, "Starting")
+        try:
+            path = self.cache.put(job.key, job.ext, lambda tmp_path: build(tmp_path, job.report))
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.message = "Failed"
+            return
+        finally:
+            if cleanup is not None:
+                cleanup()
+        job.report(1.0, "Ready")
+        job.path = path
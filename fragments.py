@@ -0,0 +1,279 @@
+"""
+Pre-rendered plan fragments
+The workout and diet generators only ever return a handful of distinct plans,
+so every section is rendered once into a content-addressed static bundle and
+responses are assembled from those fragments instead of being re-rendered.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+
+from planner import GOALS, DIET_PREFERENCES, BUDGETS, DAYS, generate_workout_plan, generate_diet_plan
+
+BUNDLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "plans")
+MANIFEST_NAME = "manifest.json"
+
+
+# Render a workout day as Markdown for the app tabs and static pages
+def render_workout_day(exercises):
+    return "\n\n".join(exercises) + "\n"
+
+# Render the 7-day workout section of the TXT export
+def render_workout_text(workout_plan):
+    text = ""
+    for day in DAYS:
+        text += f"\n{day.upper()}:\n"
+        for exercise in workout_plan[day]:
+            text += f"  {exercise}\n"
+        text += "\n"
+    return text
+
+# Render a list of meals or tips as Markdown
+def render_lines(lines):
+    return "\n\n".join(lines) + "\n"
+
+# Render the diet section of the TXT export
+def render_diet_text(diet_plan):
+    text = f"""{diet_plan['title']}
+
+Daily Meals:
+"""
+    for meal in diet_plan['meals']:
+        text += f"  {meal}\n"
+
+    text += f"""
+Nutritional Information:
+  • {diet_plan['calories']}
+  • Protein: {diet_plan['protein']}
+
+Pro Tips:
+"""
+    for tip in diet_plan['tips']:
+        text += f"  {tip}\n"
+    return text
+
+# Assemble the complete TXT export around the workout and diet sections
+def render_plan_text(profile, results, workout_text, diet_text, generated_at=None):
+    """Profile header, plan sections, health tips and disclaimer"""
+    age, gender, height, weight = profile['age'], profile['gender'], profile['height'], profile['weight']
+    goal, workout_time = profile['goal'], profile['workout_time']
+    diet_pref, budget = profile['diet_pref'], profile['budget']
+    bmi, bmi_category = results['bmi'], results['bmi_category']
+    workout_params = results['workout_params']
+    if generated_at is None:
+        generated_at = datetime.now()
+    
+    full_plan = f"""
+╔══════════════════════════════════════════════════════════════╗
+║          AI-POWERED PERSONALIZED FITNESS PLAN                ║
+║              Generated by AI Fitness Planner                 ║
+╚══════════════════════════════════════════════════════════════╝
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📋 USER PROFILE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Personal Information:
+  • Age: {age} years
+  • Gender: {gender}
+  • Height: {height} cm
+  • Weight: {weight} kg
+  • BMI: {bmi} ({bmi_category})
+
+Fitness Goals:
+  • Primary Goal: {goal}
+  • Workout Time: {workout_time} min/day
+  • Intensity Level: {workout_params['intensity']}
+  • Focus Area: {workout_params['focus']}
+
+Diet Preferences:
+  • Diet Type: {diet_pref}
+  • Budget Level: {budget}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🏋️ 7-DAY WORKOUT PLAN
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+"""
+    
+    full_plan += workout_text
+    
+    full_plan += """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🍽️ DAILY DIET PLAN
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+"""
+    full_plan += diet_text
+    
+    full_plan += """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+💡 HEALTH TIPS
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✅ Drink 3-4 liters of water daily
+✅ Sleep 7-8 hours every night
+✅ Warm up before and cool down after workouts
+✅ Track your progress weekly
+✅ Stay consistent with your routine
+✅ Avoid junk food and sugary drinks
+✅ Listen to your body and rest when needed
+✅ Progressive overload is key for results
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+⚠️ DISCLAIMER
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+This plan is generated by AI for general guidance. Always consult
+with healthcare professionals before starting any new diet or
+exercise program, especially if you have existing health conditions.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Generated on: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}
+Powered by: Streamlit + Hugging Face + scikit-learn
+
+Stay Fit, Stay Healthy! 💪
+"""
+    return full_plan
+
+def diet_key(diet_pref, budget, goal):
+    return f"{diet_pref}|{budget}|{goal}"
+
+# Every fragment file a manifest refers to
+def fragment_names(manifest):
+    names = {name for entry in manifest["workout"].values() for name in entry.values()}
+    names |= {entry[part] for entry in manifest["diet"].values() for part in ("meals", "tips", "export")}
+    return names
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# Fingerprint of every distinct plan the generators can return
+def catalog_version():
+    """Hash of the plan catalog, changes only when plan content changes"""
+    catalog = {
+        "workout": {goal: generate_workout_plan(goal, None, None, None) for goal in GOALS},
+        "diet": {
+            diet_key(diet_pref, budget, goal): generate_diet_plan(goal, diet_pref, budget, None)
+            for diet_pref in DIET_PREFERENCES for budget in BUDGETS for goal in GOALS
+        },
+    }
+    return _digest(json.dumps(catalog, sort_keys=True, ensure_ascii=False))[:16]
+
+# Functions that turn plans into fragment and export text
+RENDERERS = (render_workout_day, render_workout_text, render_lines, render_diet_text, render_plan_text)
+
+# Freshness key of a rendered bundle, separate from the permalink catalog version
+def bundle_version():
+    """Hash of the plan catalog and the renderer code, changes whenever fragment text can change"""
+    source = "".join(inspect.getsource(render) for render in RENDERERS)
+    return _digest(catalog_version() + source)[:16]
+
+# Render every distinct section once
+def render_bundle():
+    """Return (manifest, fragments) where fragments maps file name -> content"""
+    fragments = {}
+
+    def add(text, ext):
+        name = f"{_digest(text)[:16]}.{ext}"
+        fragments[name] = text
+        return name
+
+    workout = {}
+    for goal in GOALS:
+        plan = generate_workout_plan(goal, None, None, None)
+        entry = {day: add(render_workout_day(plan[day]), "md") for day in DAYS}
+        entry["export"] = add(render_workout_text(plan), "txt")
+        workout[goal] = entry
+
+    diet = {}
+    for diet_pref in DIET_PREFERENCES:
+        for budget in BUDGETS:
+            for goal in GOALS:
+                plan = generate_diet_plan(goal, diet_pref, budget, None)
+                diet[diet_key(diet_pref, budget, goal)] = {
+                    "title": plan['title'],
+                    "calories": plan['calories'],
+                    "protein": plan['protein'],
+                    "meals": add(render_lines(plan['meals']), "md"),
+                    "tips": add(render_lines(plan['tips']), "md"),
+                    "export": add(render_diet_text(plan), "txt"),
+                }
+
+    manifest = {
+        "catalog_version": catalog_version(),
+        "bundle_version": bundle_version(),
+        "workout": workout,
+        "diet": diet,
+    }
+    return manifest, fragments
+
+# Write the bundle so it can be served by any static file server
+def build_bundle(out_dir=BUNDLE_DIR):
+    """Write fragments and manifest.json into out_dir, return the manifest"""
+    manifest, fragments = render_bundle()
+    os.makedirs(out_dir, exist_ok=True)
+    for name, text in fragments.items():
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+class PlanBundle:
+    """In-memory view of a fragment bundle, assembled without re-rendering"""
+
+    def __init__(self, manifest, fragments):
+        self.manifest = manifest
+        self.fragments = fragments
+        self.version = manifest["catalog_version"]
+        self.bundle_version = manifest["bundle_version"]
+
+    def workout(self, goal):
+        """Day -> Markdown fragments plus the 'export' text for a goal"""
+        entry = self.manifest["workout"].get(goal, self.manifest["workout"]["Maintenance"])
+        return {name: self.fragments[file_name] for name, file_name in entry.items()}
+
+    def diet(self, diet_pref, budget, goal):
+        """Title, targets, meal/tip Markdown and 'export' text for a diet plan"""
+        entry = self.manifest["diet"].get(diet_key(diet_pref, budget, goal))
+        if entry is None:
+            # Outside the sidebar options, same fallback as generate_diet_plan
+            plan = generate_diet_plan(goal, diet_pref, budget, None)
+            return {
+                "title": plan['title'],
+                "calories": plan['calories'],
+                "protein": plan['protein'],
+                "meals": render_lines(plan['meals']),
+                "tips": render_lines(plan['tips']),
+                "export": render_diet_text(plan),
+            }
+        return {
+            name: self.fragments[value] if name in ("meals", "tips", "export") else value
+            for name, value in entry.items()
+        }
+
+# Load the static bundle, rebuilding in memory if it is missing or stale
+def load_bundle(bundle_dir=BUNDLE_DIR):
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        # Plan edits and template edits both make the bundle stale
+        if manifest.get("bundle_version") == bundle_version():
+            fragments = {}
+            try:
+                for name in fragment_names(manifest):
+                    with open(os.path.join(bundle_dir, name), encoding="utf-8") as f:
+                        fragments[name] = f.read()
+            except OSError:
+                return PlanBundle(*render_bundle())
+            return PlanBundle(manifest, fragments)
+    return PlanBundle(*render_bundle())
@@ -0,0 +1,206 @@
+"""
+Cohort analytics page: BMI, intensity and focus distributions for a student roster,
+mess procurement lists, and a background-built archive of every student's plan
+"""
+
+import os
+
+import streamlit as st
+
+from cohort import (
+    REQUIRED_COLUMNS,
+    OPTIONAL_COLUMNS,
+    DIET_COLUMNS,
+    ARCHIVE_COLUMNS,
+    ARCHIVE_MAX_ROWS,
+    file_hash,
+    summarize_roster,
+    build_cohort_archive,
+)
+from exports import ExportQueue, export_key, spool
+from fragments import load_bundle
+from procurement import procurement_list, procurement_totals, load_stored_profiles
+
+# Page configuration
+st.set_page_config(
+    page_title="Cohort Analytics",
+    page_icon="📊",
+    layout="wide"
+)
+
+# Aggregates are cached per file hash, so re-uploads and reruns are instant
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_cohort_summary(roster_hash, _roster):
+    """Summarize a roster once per distinct file content"""
+    return summarize_roster(_roster)
+
+def show_distribution(title, counts):
+    st.write(f"**{title}**")
+    st.bar_chart(counts)
+    st.dataframe(
+        counts.rename("Students").to_frame().assign(Share=(counts / max(counts.sum(), 1) * 100).round(1)),
+        use_container_width=True
+    )
+
+# One bounded worker pool and artifact cache per server process
+@st.cache_resource
+def get_export_queue():
+    return ExportQueue()
+
+@st.cache_resource
+def get_plan_bundle():
+    return load_bundle()
+
+EXPORT_REFRESH_SECONDS = 1.0
+
+# Stored plans change whenever someone generates a plan, so only cache briefly
+@st.cache_data(show_spinner=False, ttl=60)
+def load_plan_profiles(catalog_version):
+    return load_stored_profiles(catalog_version)
+
+def show_procurement(profiles, source_label, counted="students", note=None):
+    st.subheader("🛒 Mess Procurement")
+    if profiles is None or profiles.empty:
+        st.info(source_label)
+        return
+    if note:
+        st.caption(note)
+    
+    weeks = st.number_input("Weeks to plan for", min_value=1, max_value=12, value=1, key="procurement_weeks")
+    table = procurement_list(profiles, weeks=weeks).rename(columns={"students": counted})
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**By Budget Tier**")
+        st.dataframe(table, use_container_width=True, hide_index=True)
+    with col2:
+        st.write("**Total**")
+        st.dataframe(procurement_totals(table), use_container_width=True, hide_index=True)
+    
+    st.download_button(
+        label="📥 Download Procurement List (CSV)",
+        data=table.to_csv(index=False),
+        file_name=f"mess_procurement_{weeks}w.csv",
+        mime="text/csv"
+    )
+
+# Polled by st.fragment (Streamlit 1.37+) while the job runs, only this block reruns
+def export_progress(key):
+    job = get_export_queue().get(key)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"⏳ {job.message}")
+
+def show_export_job(job):
+    if not job.done:
+        st.fragment(export_progress, run_every=EXPORT_REFRESH_SECONDS)(job.key)
+    elif job.error:
+        st.error(f"❌ Export failed: {job.error}")
+    else:
+        try:
+            with open(job.path, "rb") as f:
+                st.download_button(
+                    label="📥 Download Plan Archive (ZIP)",
+                    data=f,
+                    file_name=job.file_name,
+                    mime="application/zip"
+                )
+        except OSError:
+            st.warning("The archive was evicted from the export cache, please build it again.")
+
+def show_archive_export(roster, roster_hash, total_rows):
+    st.subheader("📦 Plan Archive")
+    st.caption("One complete plan file per student, built in the background so the page stays responsive")
+    if total_rows > ARCHIVE_MAX_ROWS:
+        st.info(
+            f"Plan archives are limited to {ARCHIVE_MAX_ROWS:,} rows, this roster has {total_rows:,}. "
+            "Split it into smaller rosters to export their plans."
+        )
+        return
+    
+    queue = get_export_queue()
+    bundle = get_plan_bundle()
+    key = export_key("cohort_archive", roster_hash, bundle.bundle_version)
+    if st.button("Build Plan Archive", key="build_archive"):
+        # The upload buffer belongs to this session, the worker reads its own copy on disk
+        source = spool(roster, suffix=".csv")
+        queue.submit(
+            key, "zip", f"cohort_plans_{roster_hash[:8]}.zip",
+            lambda path, report: build_cohort_archive(source, path, bundle, report),
+            cleanup=lambda: os.remove(source),
+        )
+    
+    job = queue.get(key)
+    if job is not None:
+        show_export_job(job)
+
+def main():
+    st.title("📊 Cohort Analytics")
+    st.caption("Upload a student roster to see how plans are distributed across the cohort")
+    
+    optional = ", ".join(f"`{c}` (default {v})" for c, v in OPTIONAL_COLUMNS.items())
+    st.info(
+        f"**Required columns:** {', '.join(f'`{c}`' for c in REQUIRED_COLUMNS)}  \n"
+        f"**Optional columns:** {optional}  \n"
+        f"**For procurement:** {', '.join(f'`{c}`' for c in DIET_COLUMNS)}  \n"
+        f"**For the plan archive (optional):** {', '.join(f'`{c}`' for c in ARCHIVE_COLUMNS)}, `student_id` or `name`"
+    )
+    
+    roster = st.file_uploader("Roster CSV", type=["csv"])
+    if roster is None:
+        show_procurement(
+            load_plan_profiles(get_plan_bundle().version),
+            "No plans have been generated in the app yet. Upload a roster to plan purchases for it instead.",
+            counted="stored plans",
+            note="Without a roster, quantities are per stored plan, not per student: a student may have saved "
+                 "several plans and identical profiles share one. Upload a roster for head counts.",
+        )
+        return
+    
+    roster_hash = file_hash(roster)
+    with st.spinner("Summarizing roster..."):
+        try:
+            summary = load_cohort_summary(roster_hash, roster)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+    
+    if not summary['rows']:
+        st.warning("No valid rows found in the roster.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Students", f"{summary['rows']:,}")
+    with col2:
+        st.metric("Skipped Rows", f"{summary['skipped']:,}")
+    with col3:
+        st.metric("Mean BMI", summary['mean_bmi'])
+    with col4:
+        st.metric("Mean AI Score", f"{summary['mean_score']:.1f}/5")
+    
+    st.markdown("---")
+    
+    distributions = summary['distributions']
+    col1, col2 = st.columns(2)
+    with col1:
+        show_distribution("BMI Category", distributions['bmi_category'])
+        show_distribution("Workout Intensity", distributions['intensity'])
+    with col2:
+        show_distribution("Focus Area", distributions['focus'])
+        show_distribution("Workout Type", distributions['type'])
+    
+    st.markdown("---")
+    show_distribution("Primary Goal", distributions['goal'])
+    
+    st.markdown("---")
+    show_procurement(
+        summary['profiles'],
+        f"Add {' and '.join(f'`{c}`' for c in DIET_COLUMNS)} columns to the roster to get a procurement list."
+    )
+    
+    st.markdown("---")
+    show_archive_export(roster, roster_hash, summary['rows'] + summary['skipped'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Shareable plan permalinks
+A plan ID is a hash of the normalized profile, any measured activity shown with
+the plan and the plan catalog version, so the same inputs always get the same
+link and links only go stale when the catalog changes. Records are stored as
+small JSON files keyed by that ID, and records from an older catalog or
+unused for PLAN_MAX_AGE_DAYS are pruned so the store stays bounded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".plan_store")
+QUERY_PARAM = "plan"
+# Stored records hold personal data, keep them only while links are in use
+PLAN_MAX_AGE_DAYS = 90
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Order of the profile tuple that the ID is derived from
+PROFILE_FIELDS = [
+    "age", "gender", "height", "weight", "goal", "workout_time", "diet_pref", "budget", "activity"
+]
+# Measured activity stored with the results (see wearables.summarize_activity)
+ACTIVITY_FIELDS = ["level", "avg_steps", "avg_hr", "avg_active_minutes", "days"]
+
+
+def _normalize_value(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip()
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+# Normalize sidebar inputs so equal profiles hash equally
+def normalize_profile(profile):
+    """Return the profile as an ordered tuple of plain values"""
+    return tuple(_normalize_value(profile.get(field, "")) for field in PROFILE_FIELDS)
+
+def normalize_activity(activity):
+    if not activity:
+        return None
+    return [_normalize_value(activity.get(field)) for field in ACTIVITY_FIELDS]
+
+# Deterministic permalink ID
+def plan_id(profile, catalog_version, activity=None):
+    """Hash of the normalized profile tuple, the measured activity and the catalog version
+
+    Activity details are stored in the record, so two students with the same
+    profile but different measurements must not share an ID.
+    """
+    payload = [list(normalize_profile(profile)), catalog_version]
+    if activity:
+        payload.append(normalize_activity(activity))
+    payload = json.dumps(payload)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+def _record_path(pid, store_dir):
+    # IDs are hex digests, anything else can't be a stored plan
+    if not pid or any(c not in "0123456789abcdef" for c in pid):
+        return None
+    return os.path.join(store_dir, f"{pid}.json")
+
+_last_prune = {}
+_prune_lock = threading.Lock()
+
+# Delete records a link can no longer show, and ones nobody opened for a while
+def prune_plans(catalog_version, store_dir=STORE_DIR, max_age_days=PLAN_MAX_AGE_DAYS):
+    """Remove non-current and expired records, return how many were removed"""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    try:
+        names = os.listdir(store_dir)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(store_dir, name)
+        try:
+            if os.path.getmtime(path) >= cutoff:
+                with open(path, encoding="utf-8") as f:
+                    if is_current(json.load(f), catalog_version):
+                        continue
+            os.remove(path)
+        except (OSError, ValueError):
+            continue
+        removed += 1
+    return removed
+
+# Save a generated plan under its ID
+def save_plan(profile, results, catalog_version, store_dir=STORE_DIR):
+    """Store the profile and computed results, return the plan ID"""
+    pid = plan_id(profile, catalog_version, results.get("activity"))
+    path = _record_path(pid, store_dir)
+    if not os.path.exists(path):
+        record = {
+            "id": pid,
+            "catalog_version": catalog_version,
+            "profile": dict(zip(PROFILE_FIELDS, normalize_profile(profile))),
+            "results": results,
+        }
+        os.makedirs(store_dir, exist_ok=True)
+        # Streamlit sessions are threads of one process, so the pid alone isn't unique
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        try:
+            os.replace(tmp_path, path)
+        except FileNotFoundError:
+            # Records for one ID are identical, a concurrent writer already stored it
+            if not os.path.exists(path):
+                raise
+    else:
+        # Saving again counts as a use
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+    
+    # Prune at most once per interval, not on every save
+    with _prune_lock:
+        due = time.time() - _last_prune.get(store_dir, 0) >= PRUNE_INTERVAL_SECONDS
+        if due:
+            _last_prune[store_dir] = time.time()
+    if due:
+        prune_plans(catalog_version, store_dir)
+    return pid
+
+# Resolve a permalink
+def load_plan(pid, store_dir=STORE_DIR):
+    """Return the stored record for an ID, or None if it doesn't exist"""
+    path = _record_path(pid, store_dir)
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        record = json.load(f)
+    # Opening a link keeps it alive, see prune_plans
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return record
+
+# ETag-style check: a link is valid while the catalog it was built from is current
+def is_current(record, catalog_version):
+    return record.get("catalog_version") == catalog_version
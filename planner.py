@@ -0,0 +1,610 @@
+"""
+Planner logic shared by the Streamlit app, its pages and offline tools
+Pure Python / NumPy only, so it can be imported without a Streamlit runtime
+"""
+
+import numpy as np
+
+# Sidebar options, shared by the app and the offline tools
+GENDERS = ["Male", "Female"]
+GOALS = ["Fat Loss", "Muscle Gain", "Maintenance"]
+DIET_PREFERENCES = ["Vegetarian", "Non-Vegetarian"]
+BUDGETS = ["Low", "Medium", "High"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Calculate BMI and category
+def calculate_bmi(weight, height):
+    """Calculate BMI and return category"""
+    height_m = height / 100
+    bmi = weight / (height_m ** 2)
+    
+    if bmi < 18.5:
+        category = "Underweight"
+        color = "#FFA500"
+    elif 18.5 <= bmi < 25:
+        category = "Normal"
+        color = "#4CAF50"
+    elif 25 <= bmi < 30:
+        category = "Overweight"
+        color = "#FF9800"
+    else:
+        category = "Obese"
+        color = "#F44336"
+    
+    return round(bmi, 2), category, color
+
+# Determine workout intensity using ML logic
+def get_workout_parameters(bmi, goal, workout_time, age):
+    """ML-based workout parameter determination"""
+    
+    # Create decision matrix
+    intensity_score = 0
+    
+    # BMI factor
+    if bmi < 18.5:
+        intensity_score += 1
+        base_intensity = "Light to Moderate"
+        focus = "Strength Building & Weight Gain"
+    elif bmi >= 30:
+        intensity_score += 2
+        base_intensity = "Low to Moderate"
+        focus = "Cardio & Fat Loss"
+    else:
+        intensity_score += 3
+        if goal == "Fat Loss":
+            base_intensity = "Moderate to High"
+            focus = "HIIT & Cardio"
+        elif goal == "Muscle Gain":
+            base_intensity = "Moderate to High"
+            focus = "Strength Training"
+        else:
+            base_intensity = "Moderate"
+            focus = "Balanced Fitness"
+    
+    # Age factor
+    if age < 20:
+        intensity_multiplier = 1.1
+    elif age > 30:
+        intensity_multiplier = 0.9
+    else:
+        intensity_multiplier = 1.0
+    
+    # Time factor
+    if workout_time < 30:
+        workout_type = "Quick HIIT"
+    elif workout_time < 60:
+        workout_type = "Standard Routine"
+    else:
+        workout_type = "Extended Training"
+    
+    return {
+        'intensity': base_intensity,
+        'focus': focus,
+        'type': workout_type,
+        'score': intensity_score * intensity_multiplier
+    }
+
+# Generate AI-powered workout plan
+def generate_workout_plan(goal, bmi_category, workout_params, workout_time):
+    """Generate personalized 7-day workout plan"""
+    
+    plans = {
+        "Fat Loss": {
+            "Monday": [
+                "🔥 Warm-up: 5 min dynamic stretching",
+                "🏃 Cardio: 25 min running/cycling (moderate pace)",
+                "💪 Circuit Training:",
+                "  - Jumping jacks: 3 sets × 30 reps",
+                "  - Burpees: 3 sets × 12 reps",
+                "  - Mountain climbers: 3 sets × 20 reps",
+                "🧘 Cool down: 5 min stretching"
+            ],
+            "Tuesday": [
+                "🔥 Warm-up: 5 min jogging",
+                "💪 Upper Body Strength:",
+                "  - Push-ups: 4 sets × 12 reps",
+                "  - Dumbbell rows: 3 sets × 15 reps",
+                "  - Tricep dips: 3 sets × 12 reps",
+                "  - Plank: 3 sets × 45 sec",
+                "🧘 Cool down & stretch"
+            ],
+            "Wednesday": [
+                "🔥 HIIT Session (30 min):",
+                "  - Sprint intervals: 30 sec sprint, 30 sec rest × 10",
+                "  - Jump squats: 4 sets × 15 reps",
+                "  - High knees: 4 sets × 30 sec",
+                "  - Rest: 1 min between exercises",
+                "🧘 Yoga/Stretching: 15 min"
+            ],
+            "Thursday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Lower Body + Core:",
+                "  - Squats: 4 sets × 20 reps",
+                "  - Lunges: 3 sets × 15 reps each leg",
+                "  - Leg raises: 3 sets × 15 reps",
+                "  - Russian twists: 3 sets × 25 reps",
+                "  - Bicycle crunches: 3 sets × 20 reps"
+            ],
+            "Friday": [
+                "🔥 Cardio Blast:",
+                "  - Running: 30 min (interval training)",
+                "  - Jump rope: 5 sets × 2 min",
+                "💪 Core finisher:",
+                "  - Plank variations: 3 sets × 40 sec each",
+                "🧘 Cool down"
+            ],
+            "Saturday": [
+                "🔥 Full Body Circuit:",
+                "  - Burpees: 3 sets × 15 reps",
+                "  - Push-ups: 3 sets × 15 reps",
+                "  - Squats: 3 sets × 20 reps",
+                "  - Mountain climbers: 3 sets × 25 reps",
+                "  - Plank: 3 sets × 1 min",
+                "🧘 Stretching: 10 min"
+            ],
+            "Sunday": [
+                "🌟 Active Recovery:",
+                "  - Light yoga: 30 min",
+                "  - Walking/Cycling: 30 min (easy pace)",
+                "  - Foam rolling & stretching",
+                "💧 Focus on hydration & rest"
+            ]
+        },
+        "Muscle Gain": {
+            "Monday": [
+                "🔥 Warm-up: 5 min light cardio",
+                "💪 Chest + Triceps:",
+                "  - Bench press/Push-ups: 4 sets × 10 reps",
+                "  - Incline dumbbell press: 4 sets × 12 reps",
+                "  - Chest flyes: 3 sets × 12 reps",
+                "  - Tricep dips: 4 sets × 12 reps",
+                "  - Overhead tricep extension: 3 sets × 15 reps"
+            ],
+            "Tuesday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Back + Biceps:",
+                "  - Pull-ups/Chin-ups: 4 sets × 8 reps",
+                "  - Bent-over rows: 4 sets × 12 reps",
+                "  - Lat pulldowns: 3 sets × 12 reps",
+                "  - Bicep curls: 4 sets × 12 reps",
+                "  - Hammer curls: 3 sets × 15 reps"
+            ],
+            "Wednesday": [
+                "🌟 Rest Day or Light Cardio:",
+                "  - Walking: 20-30 min",
+                "  - Stretching & mobility work",
+                "  - Focus on nutrition & recovery"
+            ],
+            "Thursday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Legs (Quad Focus):",
+                "  - Squats: 5 sets × 10 reps",
+                "  - Leg press: 4 sets × 12 reps",
+                "  - Lunges: 4 sets × 12 reps each",
+                "  - Leg extensions: 3 sets × 15 reps",
+                "  - Calf raises: 4 sets × 20 reps"
+            ],
+            "Friday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Shoulders + Abs:",
+                "  - Military press: 4 sets × 10 reps",
+                "  - Lateral raises: 4 sets × 12 reps",
+                "  - Front raises: 3 sets × 12 reps",
+                "  - Rear delt flyes: 3 sets × 15 reps",
+                "  - Hanging leg raises: 4 sets × 12 reps",
+                "  - Plank: 3 sets × 1 min"
+            ],
+            "Saturday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Legs (Hamstring Focus):",
+                "  - Deadlifts: 4 sets × 8 reps",
+                "  - Romanian deadlifts: 4 sets × 10 reps",
+                "  - Leg curls: 4 sets × 12 reps",
+                "  - Bulgarian split squats: 3 sets × 10 each",
+                "  - Calf raises: 4 sets × 20 reps"
+            ],
+            "Sunday": [
+                "🌟 Complete Rest:",
+                "  - No workout",
+                "  - Focus on sleep (8+ hours)",
+                "  - Meal prep for the week",
+                "  - Light stretching if needed"
+            ]
+        },
+        "Maintenance": {
+            "Monday": [
+                "🔥 Warm-up: 5 min",
+                "💪 Full Body Strength:",
+                "  - Push-ups: 3 sets × 15 reps",
+                "  - Squats: 3 sets × 20 reps",
+                "  - Rows: 3 sets × 12 reps",
+                "  - Plank: 3 sets × 45 sec"
+            ],
+            "Tuesday": [
+                "🏃 Cardio Day:",
+                "  - Running/Cycling: 30 min moderate pace",
+                "  - Jump rope: 3 sets × 2 min",
+                "🧘 Stretching: 10 min"
+            ],
+            "Wednesday": [
+                "💪 Upper Body:",
+                "  - Push-ups: 3 sets × 12 reps",
+                "  - Dumbbell press: 3 sets × 12 reps",
+                "  - Rows: 3 sets × 12 reps",
+                "  - Bicep curls: 3 sets × 15 reps"
+            ],
+            "Thursday": [
+                "🏃 Active Recovery:",
+                "  - Yoga: 30 min",
+                "  - Walking: 20 min",
+                "  - Mobility exercises"
+            ],
+            "Friday": [
+                "💪 Lower Body + Core:",
+                "  - Squats: 3 sets × 15 reps",
+                "  - Lunges: 3 sets × 12 each",
+                "  - Deadlifts: 3 sets × 10 reps",
+                "  - Plank variations: 3 sets × 40 sec"
+            ],
+            "Saturday": [
+                "🏃 Cardio + Core:",
+                "  - Running: 25 min",
+                "  - Core circuit: 15 min",
+                "  - Stretching: 10 min"
+            ],
+            "Sunday": [
+                "🌟 Rest Day:",
+                "  - Light walking or complete rest",
+                "  - Focus on recovery"
+            ]
+        }
+    }
+    
+    return plans.get(goal, plans["Maintenance"])
+
+# Generate AI-powered diet plan
+def generate_diet_plan(goal, diet_pref, budget, bmi_category):
+    """Generate personalized Indian diet plan"""
+    
+    # Diet plans based on preferences and budget
+    diet_plans = {
+        ("Vegetarian", "Low", "Fat Loss"): {
+            "title": "🥗 Vegetarian Fat Loss Plan (Budget-Friendly)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Warm lemon water + 5 soaked almonds",
+                "🍳 Breakfast (8:00 AM): 2 moong dal cheela + green chutney + 1 banana",
+                "🍎 Mid-Morning (11:00 AM): 1 fruit (apple/orange) + green tea",
+                "🍛 Lunch (1:30 PM): 2 chapati + dal (1 bowl) + mixed veg + cucumber salad",
+                "☕ Evening (4:30 PM): Sprouts chaat (50g) + black coffee",
+                "🍲 Dinner (7:30 PM): 2 chapati + palak paneer/tofu + raita",
+                "🥛 Before Bed (10:00 PM): Turmeric milk (low-fat)"
+            ],
+            "calories": "~1500-1600 kcal/day",
+            "protein": "60-70g",
+            "tips": [
+                "💡 Use minimal oil in cooking",
+                "💡 Drink 3-4 liters of water daily",
+                "💡 Avoid rice at dinner",
+                "💡 Buy seasonal vegetables for budget"
+            ]
+        },
+        ("Vegetarian", "Medium", "Fat Loss"): {
+            "title": "🥗 Vegetarian Fat Loss Plan (Medium Budget)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Warm water + 10 almonds + 2 walnuts",
+                "🍳 Breakfast (8:00 AM): Oats upma with vegetables + 1 glass milk + 1 fruit",
+                "🍎 Mid-Morning (11:00 AM): Greek yogurt + mixed berries + green tea",
+                "🍛 Lunch (1:30 PM): 2 multigrain chapati + rajma/chole + salad + buttermilk",
+                "☕ Evening (4:30 PM): Roasted chana + paneer cubes (50g) + green tea",
+                "🍲 Dinner (7:30 PM): Quinoa/brown rice + grilled paneer + stir-fry veggies",
+                "🥛 Before Bed (10:00 PM): Protein shake or almond milk"
+            ],
+            "calories": "~1600-1700 kcal/day",
+            "protein": "75-85g",
+            "tips": [
+                "💡 Include paneer/tofu daily",
+                "💡 Use olive oil for cooking",
+                "💡 Add flax seeds to meals"
+            ]
+        },
+        ("Non-Vegetarian", "Low", "Fat Loss"): {
+            "title": "🍗 Non-Vegetarian Fat Loss Plan (Budget-Friendly)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Warm lemon water + 5 almonds",
+                "🍳 Breakfast (8:00 AM): 3 egg white omelette + 2 bread + tea",
+                "🍎 Mid-Morning (11:00 AM): 1 banana + black coffee",
+                "🍛 Lunch (1:30 PM): 2 chapati + chicken curry (100g) + dal + salad",
+                "☕ Evening (4:30 PM): 2 boiled eggs + green tea",
+                "🍲 Dinner (7:30 PM): Grilled chicken (150g) + sautéed vegetables + raita",
+                "🥛 Before Bed (10:00 PM): Low-fat milk"
+            ],
+            "calories": "~1600-1700 kcal/day",
+            "protein": "90-100g",
+            "tips": [
+                "💡 Buy eggs in bulk (cheaper)",
+                "💡 Use chicken breast (lean protein)",
+                "💡 Include fish 2x per week if possible"
+            ]
+        },
+        ("Non-Vegetarian", "Medium", "Fat Loss"): {
+            "title": "🍗 Non-Vegetarian Fat Loss Plan (Medium Budget)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Warm water + 10 almonds + 2 walnuts",
+                "🍳 Breakfast (8:00 AM): 4 egg white + 1 whole egg omelette + oats + fruit",
+                "🍎 Mid-Morning (11:00 AM): Protein shake + 1 apple",
+                "🍛 Lunch (1:30 PM): Brown rice + grilled chicken (150g) + salad + dal",
+                "☕ Evening (4:30 PM): Tuna/chicken sandwich (whole wheat) + green tea",
+                "🍲 Dinner (7:30 PM): Fish curry/grilled chicken (150g) + vegetables + raita",
+                "🥛 Before Bed (10:00 PM): Casein protein shake or milk"
+            ],
+            "calories": "~1700-1800 kcal/day",
+            "protein": "110-120g",
+            "tips": [
+                "💡 Rotate between chicken, fish, eggs",
+                "💡 Include salmon for omega-3",
+                "💡 Meal prep on weekends"
+            ]
+        },
+        ("Vegetarian", "Low", "Muscle Gain"): {
+            "title": "💪 Vegetarian Muscle Gain Plan (Budget-Friendly)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Banana shake with peanut butter",
+                "🍳 Breakfast (8:00 AM): 3 paratha + curd + 1 glass milk",
+                "🍎 Mid-Morning (11:00 AM): Peanut butter sandwich + banana",
+                "🍛 Lunch (1:30 PM): 3 chapati + dal + paneer curry + rice + salad",
+                "☕ Evening (4:30 PM): Sprouts + roasted chana + tea with biscuits",
+                "🍲 Dinner (7:30 PM): 3 chapati + soya chunks curry + dal + curd",
+                "🥛 Before Bed (10:00 PM): Milk with protein powder/banana"
+            ],
+            "calories": "~2500-2700 kcal/day",
+            "protein": "80-90g",
+            "tips": [
+                "💡 Use peanut butter for calories",
+                "💡 Soya chunks are cheap protein",
+                "💡 Eat every 2-3 hours"
+            ]
+        },
+        ("Vegetarian", "Medium", "Muscle Gain"): {
+            "title": "💪 Vegetarian Muscle Gain Plan (Medium Budget)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Protein shake + 10 almonds + 2 dates",
+                "🍳 Breakfast (8:00 AM): Oats with milk + paneer sandwich + fruits",
+                "🍎 Mid-Morning (11:00 AM): Greek yogurt + mixed nuts + banana",
+                "🍛 Lunch (1:30 PM): 4 chapati + paneer + dal + brown rice + salad",
+                "☕ Evening (4:30 PM): Protein shake + peanut butter toast",
+                "🍲 Dinner (7:30 PM): Quinoa + tofu curry + vegetables + raita",
+                "🥛 Before Bed (10:00 PM): Casein shake + almonds"
+            ],
+            "calories": "~2800-3000 kcal/day",
+            "protein": "100-120g",
+            "tips": [
+                "💡 Include paneer, tofu, legumes daily",
+                "💡 Use whey protein post-workout",
+                "💡 Track your calorie surplus"
+            ]
+        },
+        ("Non-Vegetarian", "Low", "Muscle Gain"): {
+            "title": "💪 Non-Vegetarian Muscle Gain Plan (Budget-Friendly)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): 4 boiled eggs + banana",
+                "🍳 Breakfast (8:00 AM): 4 egg omelette + 3 bread + milk",
+                "🍎 Mid-Morning (11:00 AM): Chicken sandwich + banana",
+                "🍛 Lunch (1:30 PM): 3 chapati + chicken curry (150g) + rice + dal",
+                "☕ Evening (4:30 PM): 3 boiled eggs + peanuts + tea",
+                "🍲 Dinner (7:30 PM): 4 chapati + chicken/fish (200g) + vegetables",
+                "🥛 Before Bed (10:00 PM): Milk with banana"
+            ],
+            "calories": "~2700-2900 kcal/day",
+            "protein": "130-150g",
+            "tips": [
+                "💡 Eggs are cheapest protein source",
+                "💡 Buy chicken in bulk",
+                "💡 Eat 6-7 meals per day"
+            ]
+        },
+        ("Non-Vegetarian", "Medium", "Muscle Gain"): {
+            "title": "💪 Non-Vegetarian Muscle Gain Plan (Medium Budget)",
+            "meals": [
+                "☀️ Early Morning (6:30 AM): Protein shake + 5 whole eggs",
+                "🍳 Breakfast (8:00 AM): 5 egg omelette + oats + fruits + milk",
+                "🍎 Mid-Morning (11:00 AM): Chicken breast (100g) + brown rice + nuts",
+                "🍛 Lunch (1:30 PM): 4 chapati + chicken (200g) + rice + dal + salad",
+                "☕ Evening (4:30 PM): Tuna sandwich + protein shake",
+                "🍲 Dinner (7:30 PM): Fish/chicken (200g) + quinoa + vegetables",
+                "🥛 Before Bed (10:00 PM): Casein protein + peanut butter"
+            ],
+            "calories": "~3000-3200 kcal/day",
+            "protein": "150-170g",
+            "tips": [
+                "💡 Include fish for omega-3",
+                "💡 Use supplements wisely",
+                "💡 Progressive overload in gym"
+            ]
+        }
+    }
+    
+    # Default maintenance plans
+    maintenance_plan = {
+        "title": "⚖️ Balanced Maintenance Plan",
+        "meals": [
+            "☀️ Early Morning: Warm water + nuts",
+            "🍳 Breakfast: Balanced meal with protein + carbs",
+            "🍎 Mid-Morning: Fruit + beverage",
+            "🍛 Lunch: Complete meal with all macros",
+            "☕ Evening: Light snack",
+            "🍲 Dinner: Moderate portion balanced meal",
+            "🥛 Before Bed: Light beverage"
+        ],
+        "calories": "~2000-2200 kcal/day",
+        "protein": "70-80g",
+        "tips": [
+            "💡 Maintain consistent eating schedule",
+            "💡 Balance all macronutrients",
+            "💡 Stay hydrated"
+        ]
+    }
+    
+    # Select appropriate plan
+    key = (diet_pref, budget, goal)
+    return diet_plans.get(key, maintenance_plan)
+
+# Ingredients of each meal in generate_diet_plan, in the same order as 'meals'.
+# Daily quantity per student in g, ml (milk) or pieces (eggs, fruit, bread);
+# a "(150g)" portion in a meal string must appear in that meal's entry.
+DIET_INGREDIENTS = {
+    ("Vegetarian", "Low", "Fat Loss"): [
+        {"Nuts (almonds/walnuts)": 6},
+        {"Dal": 60, "Banana": 1},
+        {"Seasonal fruit": 1},
+        {"Atta (wheat flour)": 60, "Dal": 50, "Vegetables": 200},
+        {"Sprouts": 50},
+        {"Atta (wheat flour)": 60, "Paneer": 50, "Vegetables": 150, "Curd": 100},
+        {"Milk": 200},
+    ],
+    ("Vegetarian", "Medium", "Fat Loss"): [
+        {"Nuts (almonds/walnuts)": 20},
+        {"Oats": 50, "Vegetables": 50, "Milk": 250, "Seasonal fruit": 1},
+        {"Curd": 150, "Seasonal fruit": 1},
+        {"Atta (wheat flour)": 60, "Chana/Rajma": 60, "Vegetables": 100, "Curd": 100},
+        {"Chana/Rajma": 30, "Paneer": 50},
+        {"Brown rice/Quinoa": 60, "Paneer": 100, "Vegetables": 150},
+        {"Milk": 250},
+    ],
+    ("Non-Vegetarian", "Low", "Fat Loss"): [
+        {"Nuts (almonds/walnuts)": 6},
+        {"Eggs": 3, "Bread": 2},
+        {"Banana": 1},
+        {"Atta (wheat flour)": 60, "Chicken": 100, "Dal": 50, "Vegetables": 100},
+        {"Eggs": 2},
+        {"Chicken": 150, "Vegetables": 150, "Curd": 100},
+        {"Milk": 200},
+    ],
+    ("Non-Vegetarian", "Medium", "Fat Loss"): [
+        {"Nuts (almonds/walnuts)": 20},
+        {"Eggs": 5, "Oats": 40, "Seasonal fruit": 1},
+        {"Whey/Casein protein": 30, "Seasonal fruit": 1},
+        {"Brown rice/Quinoa": 60, "Chicken": 150, "Vegetables": 100, "Dal": 50},
+        {"Bread": 2, "Chicken": 75},
+        {"Fish": 150, "Vegetables": 150, "Curd": 100},
+        {"Milk": 250},
+    ],
+    ("Vegetarian", "Low", "Muscle Gain"): [
+        {"Banana": 1, "Milk": 250, "Peanut butter": 20},
+        {"Atta (wheat flour)": 120, "Curd": 100, "Milk": 250},
+        {"Bread": 2, "Peanut butter": 20, "Banana": 1},
+        {"Atta (wheat flour)": 90, "Dal": 50, "Paneer": 75, "Rice": 80, "Vegetables": 100},
+        {"Sprouts": 50, "Chana/Rajma": 30},
+        {"Atta (wheat flour)": 120, "Soya chunks": 50, "Dal": 50, "Curd": 100, "Vegetables": 50},
+        {"Milk": 250, "Banana": 1},
+    ],
+    ("Vegetarian", "Medium", "Muscle Gain"): [
+        {"Whey/Casein protein": 30, "Nuts (almonds/walnuts)": 12, "Dates": 16},
+        {"Oats": 60, "Milk": 250, "Bread": 2, "Paneer": 50, "Seasonal fruit": 2},
+        {"Curd": 150, "Nuts (almonds/walnuts)": 20, "Banana": 1},
+        {"Atta (wheat flour)": 120, "Paneer": 100, "Dal": 50, "Brown rice/Quinoa": 60, "Vegetables": 100},
+        {"Whey/Casein protein": 30, "Milk": 250, "Bread": 2, "Peanut butter": 20},
+        {"Brown rice/Quinoa": 60, "Tofu": 100, "Vegetables": 150, "Curd": 100},
+        {"Whey/Casein protein": 30, "Milk": 250, "Nuts (almonds/walnuts)": 12},
+    ],
+    ("Non-Vegetarian", "Low", "Muscle Gain"): [
+        {"Eggs": 4, "Banana": 1},
+        {"Eggs": 4, "Bread": 3, "Milk": 250},
+        {"Bread": 2, "Chicken": 75, "Banana": 1},
+        {"Atta (wheat flour)": 90, "Chicken": 150, "Rice": 80, "Dal": 50},
+        {"Eggs": 3, "Peanuts": 30},
+        {"Atta (wheat flour)": 120, "Chicken": 200, "Vegetables": 150},
+        {"Milk": 250, "Banana": 1},
+    ],
+    ("Non-Vegetarian", "Medium", "Muscle Gain"): [
+        {"Whey/Casein protein": 30, "Milk": 250, "Eggs": 5},
+        {"Eggs": 5, "Oats": 50, "Seasonal fruit": 2, "Milk": 250},
+        {"Chicken": 100, "Brown rice/Quinoa": 60, "Nuts (almonds/walnuts)": 20},
+        {"Atta (wheat flour)": 120, "Chicken": 200, "Rice": 80, "Dal": 50, "Vegetables": 100},
+        {"Tuna": 80, "Bread": 2, "Whey/Casein protein": 30},
+        {"Fish": 200, "Brown rice/Quinoa": 60, "Vegetables": 150},
+        {"Whey/Casein protein": 30, "Milk": 250, "Peanut butter": 20},
+    ],
+}
+MAINTENANCE_INGREDIENTS = [
+    {"Nuts (almonds/walnuts)": 15},
+    {"Atta (wheat flour)": 60, "Milk": 150},
+    {"Seasonal fruit": 2},
+    {"Rice": 80, "Dal": 60, "Vegetables": 150, "Curd": 100},
+    {},
+    {"Atta (wheat flour)": 60, "Paneer": 50, "Vegetables": 100},
+    {"Milk": 150},
+]
+
+# Meal ingredients for a profile, same fallback as generate_diet_plan
+def diet_ingredients(goal, diet_pref, budget):
+    return DIET_INGREDIENTS.get((diet_pref, budget, goal), MAINTENANCE_INGREDIENTS)
+
+# Labels looked up by integer code in the vectorized helpers, in display order
+BMI_CATEGORY_LABELS = np.array(["Underweight", "Normal", "Overweight", "Obese"], dtype=object)
+INTENSITY_LABELS = np.array(
+    ["Light to Moderate", "Low to Moderate", "Moderate", "Moderate to High"], dtype=object
+)
+FOCUS_LABELS = np.array(
+    ["Strength Building & Weight Gain", "Cardio & Fat Loss", "HIIT & Cardio", "Strength Training", "Balanced Fitness"],
+    dtype=object
+)
+WORKOUT_TYPE_LABELS = np.array(["Quick HIIT", "Standard Routine", "Extended Training"], dtype=object)
+
+# Vectorized BMI for whole columns (cohort analytics, batch tools)
+def calculate_bmi_vectorized(weight, height):
+    """Array version of calculate_bmi, returns (bmi, category) arrays"""
+    height_m = np.asarray(height, dtype=np.float64) / 100
+    # float_power goes through C pow() like Python's ** so results match bit for bit
+    bmi = np.asarray(weight, dtype=np.float64) / np.float_power(height_m, 2)
+    
+    category_code = np.select([bmi < 18.5, bmi < 25, bmi < 30], [0, 1, 2], default=3)
+    category = BMI_CATEGORY_LABELS[category_code]
+    
+    return round2(bmi), category
+
+# Rounding helper for vectorized results (BMI, procurement quantities)
+def round2(values):
+    """np.round that agrees with Python's round(x, 2) on near-ties"""
+    scaled = values * 100
+    rounded = np.round(scaled) / 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(v, 2) for v in values[ties].tolist()]
+    return rounded
+
+# Vectorized workout parameters for whole columns
+def get_workout_parameters_vectorized(bmi, goal, workout_time, age):
+    """Array version of get_workout_parameters, returns a dict of arrays"""
+    bmi = np.asarray(bmi, dtype=np.float64)
+    goal = np.asarray(goal, dtype=object)
+    workout_time = np.asarray(workout_time, dtype=np.float64)
+    age = np.asarray(age, dtype=np.float64)
+    
+    underweight = bmi < 18.5
+    obese = ~underweight & (bmi >= 30)
+    fat_loss = goal == "Fat Loss"
+    muscle_gain = goal == "Muscle Gain"
+    
+    # BMI factor
+    intensity_score = np.select([underweight, obese], [1, 2], default=3)
+    base_intensity = INTENSITY_LABELS[
+        np.select([underweight, obese, fat_loss | muscle_gain], [0, 1, 3], default=2)
+    ]
+    focus = FOCUS_LABELS[
+        np.select([underweight, obese, fat_loss, muscle_gain], [0, 1, 2, 3], default=4)
+    ]
+    
+    # Age factor
+    intensity_multiplier = np.select([age < 20, age > 30], [1.1, 0.9], default=1.0)
+    
+    # Time factor
+    workout_type = WORKOUT_TYPE_LABELS[
+        np.select([workout_time < 30, workout_time < 60], [0, 1], default=2)
+    ]
+    
+    return {
+        'intensity': base_intensity,
+        'focus': focus,
+        'type': workout_type,
+        'score': intensity_score * intensity_multiplier
+    }
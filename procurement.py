@@ -0,0 +1,147 @@
+"""
+Mess procurement lists
+A vectorized engine that turns a set of students (roster rows, stored plans or
+pre-counted profile groups) into weekly purchase quantities per item and budget
+tier, from the meal ingredients in planner.DIET_INGREDIENTS.
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from planner import DIET_PREFERENCES, BUDGETS, GOALS, DIET_INGREDIENTS, MAINTENANCE_INGREDIENTS, round2
+
+# Purchase unit for each item and how many base units (g, ml, pcs) it holds
+ITEMS = {
+    "Atta (wheat flour)": ("kg", 1000),
+    "Rice": ("kg", 1000),
+    "Brown rice/Quinoa": ("kg", 1000),
+    "Oats": ("kg", 1000),
+    "Dal": ("kg", 1000),
+    "Chana/Rajma": ("kg", 1000),
+    "Sprouts": ("kg", 1000),
+    "Soya chunks": ("kg", 1000),
+    "Paneer": ("kg", 1000),
+    "Tofu": ("kg", 1000),
+    "Curd": ("kg", 1000),
+    "Milk": ("L", 1000),
+    "Eggs": ("pcs", 1),
+    "Chicken": ("kg", 1000),
+    "Fish": ("kg", 1000),
+    "Tuna": ("kg", 1000),
+    "Vegetables": ("kg", 1000),
+    "Banana": ("pcs", 1),
+    "Seasonal fruit": ("pcs", 1),
+    "Bread": ("slices", 1),
+    "Nuts (almonds/walnuts)": ("kg", 1000),
+    "Dates": ("kg", 1000),
+    "Peanuts": ("kg", 1000),
+    "Peanut butter": ("kg", 1000),
+    "Whey/Casein protein": ("kg", 1000),
+}
+
+PROFILE_COLUMNS = ["diet_pref", "budget", "goal"]
+
+
+# Plan x item matrix of daily base-unit quantities, plus profile -> plan lookup
+def _build_tables():
+    # One row per (diet_pref, budget, goal) plan, the last row is the maintenance fallback
+    plans = list(DIET_INGREDIENTS) + [None]
+    items = list(ITEMS)
+    quantities = np.zeros((len(plans), len(items)))
+    for i, plan in enumerate(plans):
+        meals = DIET_INGREDIENTS[plan] if plan is not None else MAINTENANCE_INGREDIENTS
+        for meal in meals:
+            for item, amount in meal.items():
+                quantities[i, items.index(item)] += amount
+
+    # Flat (diet_pref, budget, goal) code -> plan row
+    fallback = len(plans) - 1
+    lookup = np.full(len(DIET_PREFERENCES) * len(BUDGETS) * len(GOALS), fallback, dtype=np.int64)
+    for d, diet_pref in enumerate(DIET_PREFERENCES):
+        for b, budget in enumerate(BUDGETS):
+            for g, goal in enumerate(GOALS):
+                if (diet_pref, budget, goal) in DIET_INGREDIENTS:
+                    lookup[(d * len(BUDGETS) + b) * len(GOALS) + g] = plans.index((diet_pref, budget, goal))
+    return plans, items, quantities, lookup, fallback
+
+PLANS, ITEM_NAMES, QUANTITIES, PLAN_LOOKUP, FALLBACK_PLAN = _build_tables()
+
+
+def _codes(values, categories):
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+# Count students per diet plan and budget tier
+def plan_counts(profiles):
+    """Plan x budget matrix of student counts
+
+    profiles has diet_pref, budget and goal columns, and optionally a
+    'students' column when each row stands for a group of students.
+    """
+    d = _codes(profiles["diet_pref"], DIET_PREFERENCES)
+    b = _codes(profiles["budget"], BUDGETS)
+    g = _codes(profiles["goal"], GOALS)
+    known = (d >= 0) & (b >= 0) & (g >= 0)
+    flat = (d * len(BUDGETS) + b) * len(GOALS) + g
+    plans = np.where(known, PLAN_LOOKUP[np.where(known, flat, 0)], FALLBACK_PLAN)
+
+    # Unknown budgets get their own "Other" tier column
+    tiers = np.where(b >= 0, b, len(BUDGETS))
+    weights = profiles["students"].to_numpy(dtype=np.float64) if "students" in profiles else None
+    counts = np.bincount(
+        plans * (len(BUDGETS) + 1) + tiers, weights=weights, minlength=len(PLANS) * (len(BUDGETS) + 1)
+    )
+    return counts.reshape(len(PLANS), len(BUDGETS) + 1)
+
+# Weekly purchase list grouped by budget tier and item
+def procurement_list(profiles, weeks=1):
+    """DataFrame of budget, item, quantity, unit, students for the given weeks"""
+    counts = plan_counts(profiles)
+    # (tier x plan) @ (plan x item) -> tier x item daily totals
+    needs = counts.T @ QUANTITIES * 7 * weeks
+    tiers = BUDGETS + ["Other"]
+    students = counts.sum(axis=0)
+
+    per_unit = np.array([ITEMS[item][1] for item in ITEM_NAMES], dtype=np.float64)
+    tier_idx, item_idx = np.nonzero(needs)
+    table = pd.DataFrame({
+        "budget": np.array(tiers, dtype=object)[tier_idx],
+        "item": np.array(ITEM_NAMES, dtype=object)[item_idx],
+        "quantity": round2(needs[tier_idx, item_idx] / per_unit[item_idx]),
+        "unit": np.array([ITEMS[item][0] for item in ITEM_NAMES], dtype=object)[item_idx],
+        "students": students[tier_idx].astype(np.int64),
+    })
+    return table
+
+# Totals per item across all budget tiers
+def procurement_totals(table):
+    return (
+        table.groupby(["item", "unit"], sort=False, as_index=False)["quantity"].sum()
+        .sort_values("quantity", ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+
+# Profiles of every current plan generated in the app (see permalinks.py)
+def load_stored_profiles(catalog_version, store_dir=None):
+    """DataFrame of diet_pref, budget, goal for every stored plan record of the current catalog
+
+    Each row is a stored plan, not a student: one student may have saved
+    several plans, and students with identical profiles share one record.
+    """
+    from permalinks import STORE_DIR, is_current
+    if store_dir is None:
+        store_dir = STORE_DIR
+    rows = []
+    for path in glob.glob(os.path.join(store_dir, "*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            # Pruned or still being written
+            continue
+        if is_current(record, catalog_version):
+            rows.append([record["profile"].get(column) for column in PROFILE_COLUMNS])
+    return pd.DataFrame(rows, columns=PROFILE_COLUMNS)
@@ -0,0 +1,570 @@
+"""
+Equivalence and performance checks for the optimized planner paths
+Every fast path (vectorized BMI / workout parameters, the pre-rendered plan
+bundle, the procurement lookup tables, the exercise bitset indexes and the
+chunked roster summaries and plan archives) is compared against the
+reference functions in planner.py over the whole bounded sidebar space, the
+BMI boundaries at 18.5/25/30, the maintenance fallbacks and random fuzz
+inputs. The meal ingredient table is checked against the meal strings it
+describes, and stored permalinks must load back unchanged. Then each fast
+path is timed against its reference and must keep a minimum speedup.
+
+Run after touching planner.py or any optimized path:
+
+Usage: python verify_planner.py [--fuzz N] [--seed S] [--no-perf]
+"""
+
+import argparse
+import io
+import itertools
+import json
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from planner import (
+    GENDERS,
+    GOALS,
+    DIET_PREFERENCES,
+    BUDGETS,
+    DAYS,
+    calculate_bmi,
+    get_workout_parameters,
+    generate_workout_plan,
+    generate_diet_plan,
+    calculate_bmi_vectorized,
+    get_workout_parameters_vectorized,
+    DIET_INGREDIENTS,
+    diet_ingredients,
+)
+from fragments import (
+    MANIFEST_NAME,
+    PlanBundle,
+    build_bundle,
+    catalog_version,
+    fragment_names,
+    load_bundle,
+    render_bundle,
+    render_diet_text,
+    render_lines,
+    render_plan_text,
+    render_workout_day,
+    render_workout_text,
+)
+from procurement import ITEMS, PLANS, plan_counts, procurement_list
+from exercises import (
+    EXERCISES,
+    EXERCISE_LINE,
+    IMPACT_LEVELS,
+    CONSTRAINT_PRESETS,
+    ExerciseCatalog,
+    combine_presets,
+    prescription_kind,
+)
+from cohort import OPTIONAL_COLUMNS, summarize_roster, build_cohort_archive
+from permalinks import PROFILE_FIELDS, normalize_profile, save_plan, load_plan, is_current
+from wearables import ACTIVITY_LEVELS
+
+# Sidebar bounds in app.py
+AGES = range(15, 36)
+HEIGHTS = range(120, 221)
+WEIGHTS = range(30, 151)
+WORKOUT_TIMES = range(15, 121, 5)
+
+BMI_BOUNDARIES = [18.5, 25, 30]
+# Values outside the sidebar options, which must hit the maintenance fallbacks
+UNKNOWN_OPTIONS = ["", "Unknown", None]
+
+# Minimum speedup of each fast path over its reference
+MIN_SPEEDUP = {
+    "bmi + workout parameters": 4,
+    "plan bundle": 2,
+    "procurement": 5,
+    "exercise queries": 2,
+}
+
+
+class Mismatch(AssertionError):
+    pass
+
+def expect_equal(name, case, expected, actual):
+    if expected != actual:
+        raise Mismatch(f"{name}: {case!r}\n  reference: {expected!r}\n  optimized: {actual!r}")
+
+
+# Sidebar grid, exact boundary hits and float neighbours of every boundary
+def bmi_inputs(rng, fuzz):
+    heights, weights = np.meshgrid(np.array(HEIGHTS, dtype=np.float64), np.array(WEIGHTS, dtype=np.float64))
+    heights, weights = [heights.ravel()], [weights.ravel()]
+
+    h = np.array(HEIGHTS, dtype=np.float64)
+    for boundary in BMI_BOUNDARIES:
+        w = boundary * (h / 100) ** 2
+        heights += [h, h, h]
+        weights += [w, np.nextafter(w, 0), np.nextafter(w, np.inf)]
+    # Integer inputs that land exactly on a boundary (e.g. 74 kg at 200 cm is 18.5)
+    heights.append(np.array([200.0, 200.0, 200.0, 160.0, 180.0]))
+    weights.append(np.array([74.0, 100.0, 120.0, 64.0, 81.0]))
+
+    heights.append(rng.uniform(HEIGHTS[0], HEIGHTS[-1], fuzz))
+    weights.append(rng.uniform(WEIGHTS[0], WEIGHTS[-1], fuzz))
+    return np.concatenate(weights), np.concatenate(heights)
+
+def check_bmi(rng, fuzz):
+    weight, height = bmi_inputs(rng, fuzz)
+    bmi, category = calculate_bmi_vectorized(weight, height)
+    for case in zip(weight.tolist(), height.tolist(), bmi.tolist(), category.tolist()):
+        expect_equal("calculate_bmi", case[:2], calculate_bmi(*case[:2])[:2], case[2:])
+
+    categories = Counter(category.tolist())
+    expect_equal("BMI category coverage", "all categories", {"Underweight", "Normal", "Overweight", "Obese"}, set(categories))
+    return len(weight)
+
+def check_workout_parameters(rng, fuzz):
+    # Every branch value on both sides of every threshold, crossed with each other
+    bmis = [18.5, 30.0, 25.0, float(np.nextafter(18.5, 0)), float(np.nextafter(30, 0)), 10.0, 22.0, 45.0]
+    bmis += calculate_bmi_vectorized(*bmi_inputs(rng, 200))[0][-200:].tolist()
+    goals = GOALS + UNKNOWN_OPTIONS
+    times = list(WORKOUT_TIMES) + [29.999, 30, 59.999, 60]
+    ages = list(AGES) + [19.999, 20, 30, 30.001]
+
+    grid = list(itertools.product(bmis, goals, times, ages))
+    fuzzed = zip(
+        rng.uniform(10, 50, fuzz).tolist(),
+        rng.choice(np.array(goals, dtype=object), fuzz).tolist(),
+        rng.uniform(WORKOUT_TIMES[0], WORKOUT_TIMES[-1], fuzz).tolist(),
+        rng.uniform(AGES[0], AGES[-1], fuzz).tolist(),
+    )
+    cases = grid + list(fuzzed)
+    bmi, goal, workout_time, age = (list(column) for column in zip(*cases))
+    params = get_workout_parameters_vectorized(bmi, np.array(goal, dtype=object), workout_time, age)
+    columns = [params['intensity'].tolist(), params['focus'].tolist(), params['type'].tolist(), params['score'].tolist()]
+    for case, intensity, focus, workout_type, score in zip(cases, *columns):
+        actual = {'intensity': intensity, 'focus': focus, 'type': workout_type, 'score': score}
+        expect_equal("get_workout_parameters", case, get_workout_parameters(*case), actual)
+    return len(cases)
+
+def reference_workout(goal):
+    plan = generate_workout_plan(goal, None, None, None)
+    fragments = {day: render_workout_day(plan[day]) for day in DAYS}
+    fragments["export"] = render_workout_text(plan)
+    return fragments
+
+def reference_diet(diet_pref, budget, goal):
+    plan = generate_diet_plan(goal, diet_pref, budget, None)
+    return {
+        "title": plan['title'],
+        "calories": plan['calories'],
+        "protein": plan['protein'],
+        "meals": render_lines(plan['meals']),
+        "tips": render_lines(plan['tips']),
+        "export": render_diet_text(plan),
+    }
+
+def check_plan_bundle(rng, fuzz):
+    with tempfile.TemporaryDirectory() as bundle_dir:
+        build_bundle(bundle_dir)
+        bundles = {"in-memory": PlanBundle(*render_bundle()), "on-disk": load_bundle(bundle_dir)}
+        checked = 0
+        for label, bundle in bundles.items():
+            for goal in GOALS + UNKNOWN_OPTIONS:
+                expect_equal(f"workout bundle ({label})", goal, reference_workout(goal), bundle.workout(goal))
+                checked += 1
+            for diet_pref, budget, goal in itertools.product(
+                DIET_PREFERENCES + UNKNOWN_OPTIONS, BUDGETS + UNKNOWN_OPTIONS, GOALS + UNKNOWN_OPTIONS
+            ):
+                case = (diet_pref, budget, goal)
+                expect_equal(f"diet bundle ({label})", case, reference_diet(*case), bundle.diet(*case))
+                checked += 1
+
+        # A bundle built by other renderers must be re-rendered, not served from disk
+        for name in fragment_names(bundles["on-disk"].manifest):
+            with open(f"{bundle_dir}/{name}", "a", encoding="utf-8") as f:
+                f.write("stale\n")
+        with open(f"{bundle_dir}/{MANIFEST_NAME}", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["bundle_version"] = "stale"
+        with open(f"{bundle_dir}/{MANIFEST_NAME}", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        stale = load_bundle(bundle_dir)
+        for goal in GOALS:
+            expect_equal("workout bundle (stale on-disk)", goal, reference_workout(goal), stale.workout(goal))
+            checked += 1
+    return checked
+
+# Plan generate_diet_plan picks for a profile, None for the maintenance fallback
+def reference_plan_key(diet_pref, budget, goal):
+    maintenance = generate_diet_plan(None, None, None, None)['title']
+    if generate_diet_plan(goal, diet_pref, budget, None)['title'] == maintenance:
+        return None
+    return (diet_pref, budget, goal)
+
+# Per-student loop over the meal tables, the reference for procurement_list
+def reference_procurement(profiles, weeks):
+    totals = {}
+    for diet_pref, budget, goal in profiles.itertuples(index=False):
+        tier = budget if budget in BUDGETS else "Other"
+        for meal in diet_ingredients(goal, diet_pref, budget):
+            for item, amount in meal.items():
+                totals[tier, item] = totals.get((tier, item), 0) + amount * 7 * weeks
+    return {key: round(total / ITEMS[key[1]][1], 2) for key, total in totals.items()}
+
+# "grilled chicken (150g)": the food named in the same "+" part as a gram portion
+GRAM_PORTION = re.compile(r"([^+:]*)\((\d+)g\)")
+
+def _words(text):
+    return set(re.findall(r"[a-z]+", text.lower()))
+
+# The ingredient table must describe the meals generate_diet_plan actually returns
+def check_diet_ingredients(rng, fuzz):
+    checked = 0
+    for diet_pref, budget, goal in itertools.product(
+        DIET_PREFERENCES + UNKNOWN_OPTIONS, BUDGETS + UNKNOWN_OPTIONS, GOALS + UNKNOWN_OPTIONS
+    ):
+        case = (diet_pref, budget, goal)
+        key = reference_plan_key(*case)
+        expect_equal("DIET_INGREDIENTS plans", case, key is not None, case in DIET_INGREDIENTS)
+        meals = generate_diet_plan(goal, diet_pref, budget, None)['meals']
+        ingredients = diet_ingredients(goal, diet_pref, budget)
+        expect_equal("DIET_INGREDIENTS meal count", case, len(meals), len(ingredients))
+        for meal, portions in zip(meals, ingredients):
+            unknown = [item for item in portions if item not in ITEMS]
+            expect_equal("DIET_INGREDIENTS items", meal, [], unknown)
+            for food, grams in GRAM_PORTION.findall(meal):
+                named = {item: amount for item, amount in portions.items() if _words(item) & _words(food)}
+                if int(grams) not in named.values():
+                    expect_equal("DIET_INGREDIENTS portions", meal, {food.strip(): int(grams)}, named)
+            checked += 1
+    return checked
+
+def random_profiles(rng, n):
+    return pd.DataFrame({
+        "diet_pref": rng.choice(np.array(DIET_PREFERENCES + UNKNOWN_OPTIONS, dtype=object), n),
+        "budget": rng.choice(np.array(BUDGETS + UNKNOWN_OPTIONS, dtype=object), n),
+        "goal": rng.choice(np.array(GOALS + UNKNOWN_OPTIONS, dtype=object), n),
+    })
+
+def check_procurement(rng, fuzz):
+    # Every single profile must land on the plan generate_diet_plan returns
+    combos = list(itertools.product(DIET_PREFERENCES + UNKNOWN_OPTIONS, BUDGETS + UNKNOWN_OPTIONS, GOALS + UNKNOWN_OPTIONS))
+    for diet_pref, budget, goal in combos:
+        counts = plan_counts(pd.DataFrame({"diet_pref": [diet_pref], "budget": [budget], "goal": [goal]}))
+        plan = PLANS[int(np.flatnonzero(counts.sum(axis=1))[0])]
+        expect_equal("procurement plan lookup", (diet_pref, budget, goal), reference_plan_key(diet_pref, budget, goal), plan)
+
+    profiles = random_profiles(rng, max(fuzz // 10, 1000))
+    table = procurement_list(profiles, weeks=3)
+    actual = {(budget, item): quantity for budget, item, quantity in zip(table["budget"], table["item"], table["quantity"])}
+    expected = reference_procurement(profiles, weeks=3)
+    for key in expected.keys() | actual.keys():
+        expect_equal("procurement_list", key, expected.get(key), actual.get(key))
+    return len(combos) + len(profiles)
+
+# Linear scan over the catalog, the reference for the bitset indexes
+def reference_query(muscle=None, equipment=None, max_impact=None, max_set_minutes=None, avoid_joints=()):
+    as_list = lambda values: [values] if isinstance(values, str) else values
+    names = []
+    for name, info in EXERCISES.items():
+        if muscle is not None and info["muscle"] not in as_list(muscle):
+            continue
+        if equipment is not None and info["equipment"] not in as_list(equipment):
+            continue
+        if max_impact is not None and IMPACT_LEVELS.index(info["impact"]) > IMPACT_LEVELS.index(max_impact):
+            continue
+        if max_set_minutes is not None and info["set_minutes"] > max_set_minutes:
+            continue
+        if set(info["joints"]) & set(avoid_joints):
+            continue
+        names.append(name)
+    return names
+
+def constraint_cases():
+    muscles = [None] + sorted({info["muscle"] for info in EXERCISES.values()})
+    minutes = [None, 0.5] + sorted({info["set_minutes"] for info in EXERCISES.values()})
+    presets = [
+        combine_presets(labels)
+        for r in range(len(CONSTRAINT_PRESETS) + 1)
+        for labels in itertools.combinations(CONSTRAINT_PRESETS, r)
+    ]
+    for muscle, max_set_minutes, preset in itertools.product(muscles, minutes, presets):
+        constraints = dict(preset)
+        if muscle is not None:
+            constraints['muscle'] = muscle
+        if max_set_minutes is not None:
+            constraints['max_set_minutes'] = max_set_minutes
+        yield constraints
+
+def check_exercise_catalog(rng, fuzz):
+    catalog = ExerciseCatalog()
+    checked = 0
+    for constraints in constraint_cases():
+        expect_equal("ExerciseCatalog.query", constraints, reference_query(**constraints), catalog.query(**constraints))
+        checked += 1
+    # No constraints must leave every plan untouched
+    for goal in GOALS:
+        plan = generate_workout_plan(goal, None, None, None)
+        expect_equal("ExerciseCatalog.replan", goal, plan, catalog.replan(plan))
+    # Swapped exercises get a prescription of their own kind (reps, timed, per side)
+    presets = [
+        combine_presets(labels)
+        for r in range(1, len(CONSTRAINT_PRESETS) + 1)
+        for labels in itertools.combinations(CONSTRAINT_PRESETS, r)
+    ]
+    for goal, constraints in itertools.product(GOALS, presets):
+        for lines in catalog.replan(generate_workout_plan(goal, None, None, None), **constraints).values():
+            for line in lines:
+                match = EXERCISE_LINE.match(line)
+                if match and " (instead of " in line:
+                    dose = match.group(3).split(" (instead of ")[0]
+                    swap = EXERCISES[match.group(2)]["prescription"]
+                    expect_equal("ExerciseCatalog.replan prescription", line, prescription_kind(swap), prescription_kind(dose))
+    return checked + len(GOALS) + len(GOALS) * len(presets)
+
+def check_cohort_summary(rng, fuzz):
+    n = max(fuzz // 10, 2000)
+    weight, height = bmi_inputs(rng, n)
+    pick = rng.choice(len(weight), n)
+    roster = pd.DataFrame({
+        "Height": height[pick],
+        "Weight": weight[pick],
+        "Age": rng.choice(np.array(list(AGES) + [19.999, 30.001]), n),
+        "Goal": rng.choice(np.array(GOALS + [" Fat Loss ", "Unknown"], dtype=object), n),
+        "Workout Time": rng.choice(np.array(list(WORKOUT_TIMES) + [29.999, 59.999]), n),
+    })
+    buffer = io.StringIO()
+    roster.to_csv(buffer, index=False, float_format="%.17g")
+    buffer.seek(0)
+    summary = summarize_roster(buffer, chunk_rows=max(n // 7, 1))
+    # The reference gets the same parsed values, CSV parsing itself isn't under test
+    buffer.seek(0)
+    roster = pd.read_csv(buffer)
+
+    expected = {name: Counter() for name in ("bmi_category", "intensity", "focus", "type", "goal")}
+    for h, w, age, goal, workout_time in roster.itertuples(index=False):
+        goal = goal.strip()
+        bmi, category, _ = calculate_bmi(w, h)
+        params = get_workout_parameters(bmi, goal, workout_time, age)
+        for name, value in (("bmi_category", category), ("intensity", params['intensity']), ("focus", params['focus']), ("type", params['type']), ("goal", goal)):
+            expected[name][value] += 1
+    for name, counts in expected.items():
+        actual = {k: int(v) for k, v in summary['distributions'][name].items() if v}
+        expect_equal("summarize_roster", name, dict(counts), actual)
+    return n
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else "-"
+
+# Per-student plan file from the scalar planner functions, the reference for build_cohort_archive
+def reference_archive(roster, generated_at):
+    files = {}
+    for index, (student, h, w, age, goal, workout_time, gender, diet_pref, budget) in enumerate(roster.itertuples(index=False)):
+        numbers = [pd.to_numeric(v, errors="coerce") for v in (h, w, age, workout_time)]
+        if any(pd.isna(v) for v in numbers[:3]) or not isinstance(goal, str) or numbers[0] <= 0:
+            continue
+        h, w, age, workout_time = (float(v) for v in numbers[:3] + [numbers[3]])
+        if np.isnan(workout_time):
+            workout_time = OPTIONAL_COLUMNS["workout_time"]
+        goal, diet_pref, budget = goal.strip(), _text(diet_pref), _text(budget)
+        bmi, category, _ = calculate_bmi(w, h)
+        profile = {
+            'age': _number(age), 'gender': gender if isinstance(gender, str) else "-",
+            'height': _number(h), 'weight': _number(w), 'goal': goal,
+            'workout_time': _number(workout_time), 'diet_pref': diet_pref, 'budget': budget,
+        }
+        results = {
+            'bmi': bmi, 'bmi_category': category,
+            'workout_params': get_workout_parameters(bmi, goal, workout_time, age),
+        }
+        workout_text = render_workout_text(generate_workout_plan(goal, None, None, None))
+        diet_text = render_diet_text(generate_diet_plan(goal, diet_pref, budget, None))
+        name = f"{index + 1:06d}_" + re.sub(r"[^\w.-]+", "_", student).strip("._")[:60]
+        files[f"{name}.txt"] = render_plan_text(profile, results, workout_text, diet_text, generated_at)
+    return files
+
+def check_cohort_archive(rng, fuzz):
+    # Plan files are large, a small roster with every kind of messy cell is enough
+    n = 300
+    weight, height = bmi_inputs(rng, n)
+    pick = rng.choice(len(weight), n)
+    blank = lambda values, share: np.where(rng.random(n) < share, None, np.array(values, dtype=object))
+    roster = pd.DataFrame({
+        "Student ID": [f"S-{i:04d}" if i % 3 else f"Roll/{i} {GENDERS[i % len(GENDERS)]}" for i in range(n)],
+        "Height": blank(np.where(rng.random(n) < 0.02, 0.0, height[pick]), 0.03),
+        "Weight": blank(weight[pick], 0.03),
+        "Age": blank(rng.choice(np.array(list(AGES) + [19.999, 30.001]), n), 0.03),
+        "Goal": blank(rng.choice(np.array(GOALS + [" Fat Loss ", "Unknown"], dtype=object), n), 0.03),
+        "Workout Time": blank(rng.choice(np.array(list(WORKOUT_TIMES) + [29.999, 59.999]), n), 0.1),
+        "Gender": blank(rng.choice(np.array(GENDERS, dtype=object), n), 0.1),
+        "Diet Pref": blank(rng.choice(np.array(DIET_PREFERENCES + [" Vegetarian", "Unknown"], dtype=object), n), 0.1),
+        "Budget": blank(rng.choice(np.array(BUDGETS + ["Medium ", "Unknown"], dtype=object), n), 0.1),
+    })
+    buffer = io.BytesIO()
+    roster.to_csv(buffer, index=False, float_format="%.17g")
+    generated_at = datetime(2024, 1, 15, 9, 30)
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        path = f"{archive_dir}/plans.zip"
+        buffer.seek(0)
+        written = build_cohort_archive(buffer, path, PlanBundle(*render_bundle()), chunk_rows=max(n // 7, 1), generated_at=generated_at)
+        with zipfile.ZipFile(path) as archive:
+            actual = {name: archive.read(name).decode("utf-8") for name in archive.namelist()}
+    buffer.seek(0)
+    expected = reference_archive(pd.read_csv(buffer, dtype=str), generated_at)
+
+    expect_equal("build_cohort_archive files", "written", len(expected), written)
+    expect_equal("build_cohort_archive files", "names", sorted(expected), sorted(actual))
+    for name, text in expected.items():
+        expect_equal("build_cohort_archive", name, text, actual[name])
+    return n
+
+def random_plan(rng):
+    goal = str(rng.choice(GOALS))
+    profile = {
+        'age': int(rng.choice(AGES)), 'gender': str(rng.choice(GENDERS)),
+        'height': float(rng.choice([rng.choice(HEIGHTS), rng.uniform(HEIGHTS[0], HEIGHTS[-1])])),
+        'weight': float(rng.choice([rng.choice(WEIGHTS), rng.uniform(WEIGHTS[0], WEIGHTS[-1])])),
+        'goal': goal, 'workout_time': int(rng.choice(WORKOUT_TIMES)),
+        'diet_pref': str(rng.choice(DIET_PREFERENCES)), 'budget': str(rng.choice(BUDGETS)),
+    }
+    bmi, category, _ = calculate_bmi(profile['weight'], profile['height'])
+    activity = None
+    if rng.random() < 0.7:
+        has_steps = rng.random() < 0.5
+        activity = {
+            'level': str(rng.choice([label for _, label in ACTIVITY_LEVELS])),
+            'avg_steps': int(rng.integers(500, 20000)) if has_steps else None,
+            'avg_hr': int(rng.integers(55, 150)) if rng.random() < 0.8 else None,
+            'avg_active_minutes': None if has_steps else round(float(rng.uniform(0, 90)), 1),
+            'days': int(rng.integers(1, 29)),
+        }
+    profile['activity'] = activity['level'] if activity and activity['level'] else ""
+    results = {
+        'bmi': bmi, 'bmi_category': category,
+        'workout_params': get_workout_parameters(bmi, goal, profile['workout_time'], profile['age']),
+        'activity': activity,
+    }
+    return profile, results
+
+# A saved plan must load back with exactly the results it was saved with
+def check_plan_roundtrip(rng, fuzz):
+    n = 500
+    version = catalog_version()
+    with tempfile.TemporaryDirectory() as store_dir:
+        for _ in range(n):
+            profile, results = random_plan(rng)
+            pid = save_plan(profile, results, version, store_dir=store_dir)
+            record = load_plan(pid, store_dir=store_dir)
+            case = (profile, results.get('activity'))
+            expect_equal("load_plan id", case, pid, record and record['id'])
+            expect_equal("load_plan results", case, results, record['results'])
+            expect_equal("load_plan profile", case, dict(zip(PROFILE_FIELDS, normalize_profile(profile))), record['profile'])
+            expect_equal("load_plan catalog", case, True, is_current(record, version))
+    return n
+
+
+CHECKS = [
+    ("calculate_bmi", check_bmi),
+    ("get_workout_parameters", check_workout_parameters),
+    ("plan bundle", check_plan_bundle),
+    ("diet ingredients", check_diet_ingredients),
+    ("procurement", check_procurement),
+    ("exercise catalog", check_exercise_catalog),
+    ("cohort summary", check_cohort_summary),
+    ("cohort archive", check_cohort_archive),
+    ("plan permalinks", check_plan_roundtrip),
+]
+
+
+def best_time(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# (reference, optimized) workloads timed against each other
+def perf_cases(rng):
+    n = 100_000
+    height = rng.uniform(HEIGHTS[0], HEIGHTS[-1], n)
+    weight = rng.uniform(WEIGHTS[0], WEIGHTS[-1], n)
+    goal = rng.choice(np.array(GOALS, dtype=object), n)
+    workout_time = rng.choice(np.array(WORKOUT_TIMES), n)
+    age = rng.choice(np.array(AGES), n)
+
+    def reference_params():
+        for w, h, g, t, a in zip(weight.tolist(), height.tolist(), goal.tolist(), workout_time.tolist(), age.tolist()):
+            get_workout_parameters(calculate_bmi(w, h)[0], g, t, a)
+
+    def optimized_params():
+        get_workout_parameters_vectorized(calculate_bmi_vectorized(weight, height)[0], goal, workout_time, age)
+
+    bundle = PlanBundle(*render_bundle())
+    combos = list(itertools.product(DIET_PREFERENCES, BUDGETS, GOALS)) * 20
+
+    def reference_plans():
+        for diet_pref, budget, g in combos:
+            reference_workout(g)
+            reference_diet(diet_pref, budget, g)
+
+    def optimized_plans():
+        for diet_pref, budget, g in combos:
+            bundle.workout(g)
+            bundle.diet(diet_pref, budget, g)
+
+    profiles = random_profiles(rng, 5_000)
+    catalog = ExerciseCatalog()
+    constraints = list(constraint_cases())
+
+    return {
+        "bmi + workout parameters": (reference_params, optimized_params),
+        "plan bundle": (reference_plans, optimized_plans),
+        "procurement": (lambda: reference_procurement(profiles, 1), lambda: procurement_list(profiles, 1)),
+        "exercise queries": (
+            lambda: [reference_query(**c) for c in constraints],
+            lambda: [catalog.query(**c) for c in constraints],
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fuzz", type=int, default=50_000, help="random cases per check (default 50000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--no-perf", action="store_true", help="skip the speedup assertions")
+    args = parser.parse_args()
+
+    failed = False
+    for name, check in CHECKS:
+        rng = np.random.default_rng(args.seed)
+        start = time.perf_counter()
+        try:
+            cases = check(rng, args.fuzz)
+        except Mismatch as e:
+            failed = True
+            print(f"❌ {name}: optimized path differs from the reference\n   {e}")
+            continue
+        print(f"✅ {name}: {cases:,} cases match ({time.perf_counter() - start:.1f}s)")
+
+    if not args.no_perf:
+        for name, (reference, optimized) in perf_cases(np.random.default_rng(args.seed)).items():
+            speedup = best_time(reference) / best_time(optimized)
+            ok = speedup >= MIN_SPEEDUP[name]
+            failed |= not ok
+            print(f"{'✅' if ok else '❌'} {name}: {speedup:.1f}x faster (minimum {MIN_SPEEDUP[name]}x)")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
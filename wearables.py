@@ -0,0 +1,344 @@
+"""
+Wearable export importer
+Stream-parses step / heart-rate exports (CSV, GPX, TCX) into daily aggregates
+and turns measured activity into adjustments for the workout and diet targets.
+Files are read incrementally, so memory stays flat regardless of export size.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+CSV_CHUNK_ROWS = 500_000
+XML_BLOCK_BYTES = 16 * 1024 * 1024
+
+# Accepted CSV column names, after lower-casing
+TIME_COLUMNS = ["timestamp", "datetime", "date", "time", "start_time", "starttime"]
+STEP_COLUMNS = ["steps", "step_count", "stepcount", "step"]
+HR_COLUMNS = ["heart_rate", "heartrate", "hr", "bpm", "heart_rate_bpm"]
+
+# Average steps/day over the recent window -> activity level
+ACTIVITY_WINDOW_DAYS = 28
+ACTIVITY_LEVELS = [
+    (5000, "Sedentary"),
+    (7500, "Lightly Active"),
+    (10000, "Active"),
+    (float("inf"), "Very Active"),
+]
+
+# How each activity level adjusts the plan
+ACTIVITY_ADJUSTMENTS = {
+    "Sedentary": {'score': 0.9, 'calories': -100},
+    "Lightly Active": {'score': 1.0, 'calories': 0},
+    "Active": {'score': 1.05, 'calories': 150},
+    "Very Active": {'score': 1.1, 'calories': 300},
+}
+STEP_DOWN_INTENSITY = {"Moderate to High": "Moderate", "Moderate": "Low to Moderate"}
+
+# Heart-rate-only exports (GPX/TCX tracks): daily minutes at or above a moderate
+# zone -> activity level. Days without a track count as inactive, averaged over
+# the calendar days covered; under a week of coverage gives no level at all.
+# Each sample is credited with the time since the previous one, capped at a
+# multiple of the file's median sample interval so pauses and gaps don't count.
+ACTIVE_HR_BPM = 110
+SAMPLE_GAP_FACTOR = 2
+MIN_ACTIVE_SPAN_DAYS = 7
+ACTIVE_MINUTE_LEVELS = [
+    (10, "Sedentary"),
+    (22, "Lightly Active"),
+    (45, "Active"),
+    (float("inf"), "Very Active"),
+]
+
+
+class DailyAggregator:
+    """Running per-day totals, fed with batches of samples"""
+
+    def __init__(self):
+        self.days = {}
+        # Heart-rate sample intervals: seconds -> samples, over the whole file and
+        # per day for samples in the active zone. Sampling is regular, so these stay small.
+        self.gaps = {}
+        self.active_gaps = {}
+        self.last_hr_time = None
+
+    def add(self, times, steps=None, heart_rate=None):
+        """Fold one batch into the totals, times is a datetime64 array in sample order"""
+        times = np.asarray(times, dtype="datetime64[s]")
+        known = ~np.isnat(times)
+        if not known.any():
+            return
+        times = times[known]
+        days = times.astype("datetime64[D]")
+        unique_days, inverse = np.unique(days, return_inverse=True)
+
+        step_totals = np.zeros(len(unique_days))
+        step_samples = np.zeros(len(unique_days))
+        if steps is not None:
+            steps = np.asarray(steps, dtype=np.float64)[known]
+            has_steps = ~np.isnan(steps)
+            step_totals = np.bincount(inverse, weights=np.where(has_steps, steps, 0), minlength=len(unique_days))
+            step_samples = np.bincount(inverse, weights=has_steps, minlength=len(unique_days))
+
+        hr_sums = np.zeros(len(unique_days))
+        hr_counts = np.zeros(len(unique_days))
+        hr_max = np.full(len(unique_days), -np.inf)
+        if heart_rate is not None:
+            heart_rate = np.asarray(heart_rate, dtype=np.float64)[known]
+            has_hr = ~np.isnan(heart_rate) & (heart_rate > 0)
+            hr_sums = np.bincount(inverse, weights=np.where(has_hr, heart_rate, 0), minlength=len(unique_days))
+            hr_counts = np.bincount(inverse, weights=has_hr, minlength=len(unique_days))
+            np.maximum.at(hr_max, inverse[has_hr], heart_rate[has_hr])
+            if has_hr.any():
+                self._add_gaps(times[has_hr].astype(np.int64), inverse[has_hr], heart_rate[has_hr], unique_days)
+
+        for i, day in enumerate(unique_days.tolist()):
+            totals = self.days.setdefault(day, [0.0, 0.0, 0.0, 0.0, -np.inf])
+            totals[0] += step_totals[i]
+            totals[1] += step_samples[i]
+            totals[2] += hr_sums[i]
+            totals[3] += hr_counts[i]
+            totals[4] = max(totals[4], hr_max[i])
+
+    def _add_gaps(self, seconds, inverse, heart_rate, unique_days):
+        # Time since the previous heart-rate sample, carried across batches
+        previous = seconds[0] if self.last_hr_time is None else self.last_hr_time
+        gaps = np.maximum(np.diff(seconds, prepend=previous), 0)
+        self.last_hr_time = seconds[-1]
+
+        values, counts = np.unique(gaps[gaps > 0], return_counts=True)
+        for gap, count in zip(values.tolist(), counts.tolist()):
+            self.gaps[gap] = self.gaps.get(gap, 0) + count
+
+        active = (heart_rate >= ACTIVE_HR_BPM) & (gaps > 0)
+        pairs, counts = np.unique(np.stack([inverse[active], gaps[active]]), axis=1, return_counts=True)
+        days = unique_days.tolist()
+        for (i, gap), count in zip(pairs.T.tolist(), counts.tolist()):
+            day_gaps = self.active_gaps.setdefault(days[i], {})
+            day_gaps[gap] = day_gaps.get(gap, 0) + count
+
+    def sample_gap_cap(self):
+        """Longest time a heart-rate sample is credited with, SAMPLE_GAP_FACTOR x the median interval"""
+        if not self.gaps:
+            return 0
+        gaps = sorted(self.gaps)
+        counts = np.cumsum([self.gaps[gap] for gap in gaps])
+        median = gaps[int(np.searchsorted(counts, counts[-1] / 2))]
+        return SAMPLE_GAP_FACTOR * median
+
+    def to_frame(self):
+        """One row per day: steps, avg_hr, max_hr, active_minutes"""
+        if not self.days:
+            return pd.DataFrame(columns=["date", "steps", "avg_hr", "max_hr", "active_minutes"])
+        dates = sorted(self.days)
+        totals = np.array([self.days[d] for d in dates])
+        cap = self.sample_gap_cap()
+        active_seconds = np.array([
+            sum(min(gap, cap) * count for gap, count in self.active_gaps.get(d, {}).items()) for d in dates
+        ], dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame({
+                "date": pd.to_datetime(dates),
+                "steps": np.where(totals[:, 1] > 0, totals[:, 0], np.nan),
+                "avg_hr": np.round(totals[:, 2] / totals[:, 3], 1),
+                "max_hr": np.where(np.isinf(totals[:, 4]), np.nan, totals[:, 4]),
+                "active_minutes": np.where(totals[:, 3] > 0, np.round(active_seconds / 60, 1), np.nan),
+            })
+
+
+def _pick_column(columns, candidates):
+    lowered = {str(c).strip().lower().replace(" ", "_"): c for c in columns}
+    for name in candidates:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+# Local date and time of each timestamp, to the second
+def _to_times(times):
+    if pd.api.types.is_numeric_dtype(times):
+        # Unix epoch timestamps, in milliseconds when too large for seconds
+        unit = "ms" if times.abs().max() > 1e11 else "s"
+        return pd.to_datetime(times, unit=unit, errors="coerce").to_numpy().astype("datetime64[s]")
+    text = times.astype("str").str.slice(0, 19).where(times.notna(), "NaT")
+    # ISO 8601 timestamps start with the local date and time, no parsing needed
+    if text[times.notna()].str.match(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}:\d{2})?$").all():
+        return np.asarray(text, dtype="datetime64[s]")
+    parsed = pd.to_datetime(times, errors="coerce")
+    if parsed.isna().all():
+        raise ValueError(f"Unrecognized timestamps in column {times.name!r}, e.g. {times.iloc[0]!r}")
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.to_numpy().astype("datetime64[s]")
+
+# CSV exports (phone health apps, Fitbit/Google Fit style)
+def _read_csv(source, aggregator):
+    header = pd.read_csv(source, nrows=0).columns
+    time_col = _pick_column(header, TIME_COLUMNS)
+    step_col = _pick_column(header, STEP_COLUMNS)
+    hr_col = _pick_column(header, HR_COLUMNS)
+    if time_col is None or (step_col is None and hr_col is None):
+        raise ValueError("CSV export needs a timestamp/date column and a steps or heart_rate column")
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    usecols = [c for c in (time_col, step_col, hr_col) if c is not None]
+    for chunk in pd.read_csv(source, usecols=usecols, chunksize=CSV_CHUNK_ROWS):
+        aggregator.add(
+            _to_times(chunk[time_col]),
+            steps=pd.to_numeric(chunk[step_col], errors="coerce").to_numpy() if step_col is not None else None,
+            heart_rate=pd.to_numeric(chunk[hr_col], errors="coerce").to_numpy() if hr_col is not None else None,
+        )
+
+# Track point patterns for GPX (<trkpt>, <time>, <gpxtpx:hr>) and TCX
+# (<Trackpoint>, <Time>, <HeartRateBpm><Value>), namespace prefixes allowed
+XML_PATTERNS = {
+    "gpx": {
+        'start': re.compile(rb"<(?:\w+:)?trkpt[\s>]"),
+        'end': re.compile(rb"</(?:\w+:)?trkpt>"),
+        'time': re.compile(rb"<(?:\w+:)?time>\s*(\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?)"),
+        'hr': re.compile(rb"<(?:\w+:)?hr>\s*(\d+(?:\.\d+)?)"),
+    },
+    "tcx": {
+        'start': re.compile(rb"<(?:\w+:)?Trackpoint[\s>]"),
+        'end': re.compile(rb"</(?:\w+:)?Trackpoint>"),
+        'time': re.compile(rb"<(?:\w+:)?Time>\s*(\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?)"),
+        'hr': re.compile(rb"<(?:\w+:)?HeartRateBpm[^>]*>\s*<(?:\w+:)?Value>\s*(\d+(?:\.\d+)?)"),
+    },
+}
+
+def _point_values(pattern, text, starts, ends):
+    """Index of the enclosing track point and the captured value for each match"""
+    matches = [(m.start(), m.group(1)) for m in pattern.finditer(text)]
+    if not matches:
+        return np.array([], dtype=np.int64), []
+    positions = np.array([pos for pos, _ in matches])
+    points = np.searchsorted(ends, positions, side="right")
+    inside = points < len(ends)
+    inside[inside] &= starts[points[inside]] <= positions[inside]
+    return points[inside], [value for (_, value), keep in zip(matches, inside) if keep]
+
+# GPX / TCX track exports, heart rate per track point
+def _read_xml(source, aggregator, patterns):
+    """Scan the file block by block with byte regexes
+
+    Only whole track points are scanned, the unfinished tail of each block is
+    carried over, so memory is bounded by the block size. This is much faster
+    than building XML elements for millions of points.
+    """
+    close = not hasattr(source, "read")
+    f = open(source, "rb") if close else source
+    try:
+        tail = b""
+        while True:
+            block = f.read(XML_BLOCK_BYTES)
+            if isinstance(block, str):
+                block = block.encode("utf-8")
+            text = tail + block
+            ends = np.array([m.end() for m in patterns['end'].finditer(text)], dtype=np.int64)
+            if not block or len(ends):
+                cut = int(ends[-1]) if len(ends) else len(text)
+                text, tail = text[:cut], text[cut:]
+                _scan_points(text, patterns, ends, aggregator)
+            else:
+                tail = text
+            if not block:
+                break
+    finally:
+        if close:
+            f.close()
+
+def _scan_points(text, patterns, ends, aggregator):
+    if not len(ends):
+        return
+    starts = np.array([m.start() for m in patterns['start'].finditer(text)], dtype=np.int64)
+    if len(starts) != len(ends):
+        raise ValueError("Malformed track: unbalanced track point tags")
+
+    times = np.full(len(ends), np.datetime64("NaT"), dtype="datetime64[s]")
+    points, values = _point_values(patterns['time'], text, starts, ends)
+    if len(points):
+        times[points] = np.array(values).astype("U19").astype("datetime64[s]")
+
+    heart_rate = np.full(len(ends), np.nan)
+    points, values = _point_values(patterns['hr'], text, starts, ends)
+    if len(points):
+        heart_rate[points] = np.array(values).astype(np.float64)
+
+    aggregator.add(times, heart_rate=heart_rate)
+
+# Import a wearable export into daily aggregates
+def import_wearable(source, file_format=None):
+    """Return a DataFrame of daily steps / heart rate for a CSV, GPX or TCX export"""
+    if file_format is None:
+        name = getattr(source, "name", source if isinstance(source, str) else "")
+        file_format = str(name).rsplit(".", 1)[-1].lower()
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    aggregator = DailyAggregator()
+    if file_format == "csv":
+        _read_csv(source, aggregator)
+    elif file_format in XML_PATTERNS:
+        _read_xml(source, aggregator, XML_PATTERNS[file_format])
+    else:
+        raise ValueError(f"Unsupported wearable export format: {file_format!r}")
+    return aggregator.to_frame()
+
+# Summarize recent activity from daily aggregates
+def summarize_activity(daily, window_days=ACTIVITY_WINDOW_DAYS):
+    """Average steps, heart rate and active minutes over the most recent days, plus an activity level
+
+    Every metric uses the same calendar window ending on the last day of the
+    export. The level comes from steps when the export has them, otherwise from
+    daily minutes at or above ACTIVE_HR_BPM (heart-rate-only GPX/TCX tracks).
+    """
+    recent = daily
+    days = 0
+    if len(daily):
+        recent = daily[daily["date"] > daily["date"].max() - pd.Timedelta(days=window_days)]
+        days = (recent["date"].max() - recent["date"].min()).days + 1
+    steps = recent["steps"].dropna()
+    heart_rate = recent["avg_hr"].dropna()
+    avg_steps = int(round(steps.mean())) if len(steps) else None
+    
+    # Tracks only exist for days with a workout, so average over calendar days
+    avg_active_minutes = None
+    active = recent[["date", "active_minutes"]].dropna()
+    active_span = 0
+    if len(active):
+        active_span = (active["date"].max() - active["date"].min()).days + 1
+        avg_active_minutes = round(float(active["active_minutes"].sum()) / active_span, 1)
+    
+    level = None
+    if avg_steps is not None:
+        level = next(name for limit, name in ACTIVITY_LEVELS if avg_steps < limit)
+    elif avg_active_minutes is not None and active_span >= MIN_ACTIVE_SPAN_DAYS:
+        # A few days of tracks can't tell a rest week from a sedentary student
+        level = next(name for limit, name in ACTIVE_MINUTE_LEVELS if avg_active_minutes < limit)
+    return {
+        'level': level,
+        'avg_steps': avg_steps,
+        'avg_hr': round(float(heart_rate.mean()), 1) if len(heart_rate) else None,
+        'avg_active_minutes': avg_active_minutes,
+        'days': days,
+    }
+
+# Activity-adjusted workout parameters
+def adjust_workout_parameters(workout_params, activity_level):
+    """Scale the score, and ease intensity for sedentary students"""
+    if activity_level not in ACTIVITY_ADJUSTMENTS:
+        return workout_params
+    adjusted = dict(workout_params)
+    adjusted['score'] = workout_params['score'] * ACTIVITY_ADJUSTMENTS[activity_level]['score']
+    if activity_level == "Sedentary":
+        adjusted['intensity'] = STEP_DOWN_INTENSITY.get(workout_params['intensity'], workout_params['intensity'])
+    return adjusted
+
+# Activity-adjusted calorie target, e.g. "~1500-1600 kcal/day"
+def adjust_calories(calories, activity_level):
+    """Shift every kcal figure in a calorie target by the activity offset"""
+    offset = ACTIVITY_ADJUSTMENTS.get(activity_level, {}).get('calories', 0)
+    if not offset:
+        return calories
+    return re.sub(r"\d+(?= *(?:-|kcal))", lambda m: str(int(m.group()) + offset), calories)